@@ -0,0 +1 @@
+# Offline benchmark harness: scripted model, local test site and load driver.
@@ -0,0 +1,180 @@
+import asyncio
+import itertools
+import time
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+
+from google.genai import types
+
+# A turn is a list of steps: ("text", str) or ("call", name, args).
+Turn = list[tuple[Any, ...]]
+
+
+def browse_scenario(base_url: str) -> list[Turn]:
+    return [
+        [
+            ("text", "Opening the benchmark site."),
+            ("call", "navigate", {"url": f"{base_url}/"}),
+        ],
+        [
+            ("call", "type_text_at", {"x": 208, "y": 244, "text": "benchmark row", "press_enter": False}),
+            ("call", "click_at", {"x": 403, "y": 244}),
+        ],
+        [("call", "scroll_document", {"direction": "down"})],
+        [("call", "scroll_document", {"direction": "up"})],
+        [("call", "click_at", {"x": 104, "y": 83})],
+        [("call", "hover_at", {"x": 208, "y": 333})],
+        [("call", "key_combination", {"keys": "End"})],
+        [("call", "go_back", {})],
+        [("text", "Finished the benchmark walkthrough.")],
+    ]
+
+
+def idle_scenario(base_url: str) -> list[Turn]:
+    # Actions that leave the page untouched; exercises settle and frame dedup paths.
+    return [
+        [("call", "open_web_browser", {})],
+        [("call", "hover_at", {"x": 900, "y": 900})],
+        [("call", "hover_at", {"x": 901, "y": 900})],
+        [("text", "Nothing to do.")],
+    ]
+
+
+def search_scenario(base_url: str) -> list[Turn]:
+    # The driver points GEMINI_SEARCH_URL and GEMINI_SEARCH_QUERY_URL at the local site.
+    return [
+        [("call", "search", {"query": "benchmark row"})],
+        [("call", "click_at", {"x": 208, "y": 144})],
+        [("call", "search", {})],
+        [("call", "type_text_at", {"x": 208, "y": 61, "text": "second query", "press_enter": True})],
+        [("text", "Finished searching.")],
+    ]
+
+
+SCENARIOS = {
+    "browse": browse_scenario,
+    "idle": idle_scenario,
+    "search": search_scenario,
+}
+
+
+@dataclass
+class ModelCallRecord:
+    started_at: float
+    first_chunk_at: float | None = None
+    call_emitted_at: list[float] = field(default_factory=list)
+    # Contents sent on the wire, and how many came from a cached prefix instead.
+    sent_contents: int = 0
+    cached_contents: int = 0
+    cached_content: str | None = None
+
+
+class _ScriptedModels:
+    def __init__(self, owner: "ScriptedGeminiClient") -> None:
+        self._owner = owner
+
+    async def generate_content(self, *, model: str, contents: list[types.Content], config: Any) -> Any:
+        parts: list[types.Part] = []
+        async for chunk in await self.generate_content_stream(model=model, contents=contents, config=config):
+            parts.extend(chunk.candidates[0].content.parts)
+        return types.GenerateContentResponse(
+            candidates=[types.Candidate(content=types.Content(role="model", parts=parts))]
+        )
+
+    async def generate_content_stream(
+        self,
+        *,
+        model: str,
+        contents: list[types.Content],
+        config: Any,
+    ) -> AsyncIterator[types.GenerateContentResponse]:
+        return self._owner._stream(contents, getattr(config, "cached_content", None))
+
+
+class _ScriptedCaches:
+    # Stands in for client.aio.caches; cached contents are prepended to later requests.
+    def __init__(self, owner: "ScriptedGeminiClient") -> None:
+        self._owner = owner
+        self._names = itertools.count(1)
+
+    async def create(self, *, model: str, config: types.CreateCachedContentConfig) -> types.CachedContent:
+        name = f"cachedContents/scripted-{next(self._names)}"
+        self._owner.caches[name] = list(config.contents or [])
+        self._owner.created_caches.append(name)
+        return types.CachedContent(name=name, model=model)
+
+    async def delete(self, *, name: str) -> None:
+        if self._owner.caches.pop(name, None) is None:
+            raise KeyError(f"Unknown cached content: {name}")
+        self._owner.deleted_caches.append(name)
+
+
+class ScriptedGeminiClient:
+    def __init__(
+        self,
+        *,
+        scenario: list[Turn],
+        latency_ms: float = 0.0,
+        chunk_delay_ms: float = 0.0,
+    ) -> None:
+        self.scenario = scenario
+        self.latency_ms = latency_ms
+        self.chunk_delay_ms = chunk_delay_ms
+        # Keyed by instruction text, so give each benchmark session a unique instruction.
+        self.records: dict[str, list[ModelCallRecord]] = {}
+        self.caches: dict[str, list[types.Content]] = {}
+        self.created_caches: list[str] = []
+        self.deleted_caches: list[str] = []
+        self.aio = SimpleNamespace(models=_ScriptedModels(self), caches=_ScriptedCaches(self))
+
+    @staticmethod
+    def _turn_index(contents: list[types.Content]) -> int:
+        # Model turns since the latest instruction, so follow-ups replay the scenario too.
+        turns = 0
+        for content in reversed(contents):
+            parts = content.parts or []
+            if content.role == "user" and not any(part.function_response for part in parts):
+                break
+            turns += content.role == "model"
+        return turns
+
+    @staticmethod
+    def _instruction(contents: list[types.Content]) -> str:
+        for part in contents[0].parts or []:
+            if part.text:
+                return part.text
+        return ""
+
+    async def _stream(
+        self,
+        contents: list[types.Content],
+        cached_content: str | None = None,
+    ) -> AsyncIterator[types.GenerateContentResponse]:
+        record = ModelCallRecord(
+            started_at=time.perf_counter(),
+            sent_contents=len(contents),
+            cached_content=cached_content,
+        )
+        if cached_content is not None:
+            # A deleted or unknown cache fails the request, as the provider does.
+            prefix = self.caches[cached_content]
+            record.cached_contents = len(prefix)
+            contents = prefix + list(contents)
+        self.records.setdefault(self._instruction(contents), []).append(record)
+        turn_index = min(self._turn_index(contents), len(self.scenario) - 1)
+
+        await asyncio.sleep(self.latency_ms / 1000.0)
+        for step_index, step in enumerate(self.scenario[turn_index]):
+            if step_index and self.chunk_delay_ms:
+                await asyncio.sleep(self.chunk_delay_ms / 1000.0)
+            if step[0] == "text":
+                part = types.Part(text=step[1])
+            else:
+                part = types.Part(function_call=types.FunctionCall(name=step[1], args=dict(step[2])))
+                record.call_emitted_at.append(time.perf_counter())
+            if record.first_chunk_at is None:
+                record.first_chunk_at = time.perf_counter()
+            yield types.GenerateContentResponse(
+                candidates=[types.Candidate(content=types.Content(role="model", parts=[part]))]
+            )
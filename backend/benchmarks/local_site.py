@@ -0,0 +1,139 @@
+import html
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# Elements sit at fixed positions so scripted normalized coordinates land on them
+# in the default 1440x900 viewport.
+INDEX_HTML = """<!doctype html>
+<html>
+<head>
+  <title>Operator bench</title>
+  <link rel="stylesheet" href="/static/site.css">
+</head>
+<body>
+  <a id="dynamic-link" href="/dynamic" style="position:absolute;left:100px;top:60px;width:100px;height:30px">Dynamic page</a>
+  <input id="query" style="position:absolute;left:100px;top:200px;width:400px;height:40px" placeholder="Query">
+  <button id="go" style="position:absolute;left:520px;top:200px;width:120px;height:40px">Add row</button>
+  <img src="/static/logo.svg" alt="" style="position:absolute;left:700px;top:60px;width:64px;height:64px">
+  <ul id="rows" style="position:absolute;left:100px;top:280px"></ul>
+  <div style="height:3000px"></div>
+  <script src="/static/site.js"></script>
+</body>
+</html>
+"""
+
+DYNAMIC_HTML = """<!doctype html>
+<html>
+<head>
+  <title>Operator bench dynamic</title>
+  <link rel="stylesheet" href="/static/site.css">
+</head>
+<body>
+  <a href="/" style="position:absolute;left:100px;top:60px;width:100px;height:30px">Home</a>
+  <div id="hover-target" class="hover-target" style="position:absolute;left:250px;top:250px;width:100px;height:100px">Hover</div>
+  <ul id="items" style="position:absolute;left:100px;top:400px"><li>Loading…</li></ul>
+  <script>
+    fetch('/api/items?delay_ms=300')
+      .then((response) => response.json())
+      .then((items) => {
+        document.getElementById('items').innerHTML = items.map((item) => `<li>${item}</li>`).join('');
+      });
+  </script>
+</body>
+</html>
+"""
+
+SEARCH_HTML = """<!doctype html>
+<html>
+<head><title>Results for {query}</title></head>
+<body>
+  <form action="/search" style="position:absolute;left:100px;top:40px">
+    <input name="q" value="{query}" style="width:400px;height:30px">
+  </form>
+  <ol style="position:absolute;left:100px;top:120px">{results}</ol>
+</body>
+</html>
+"""
+
+SITE_CSS = """
+body { font-family: sans-serif; margin: 0; }
+.hover-target { background: #ddd; }
+.hover-target:hover { background: #4a90e2; color: white; }
+"""
+
+SITE_JS = """
+document.getElementById('go').addEventListener('click', () => {
+  const row = document.createElement('li');
+  row.textContent = document.getElementById('query').value || 'row';
+  document.getElementById('rows').appendChild(row);
+});
+"""
+
+LOGO_SVG = """<svg xmlns="http://www.w3.org/2000/svg" width="64" height="64">
+<circle cx="32" cy="32" r="28" fill="#4a90e2"/></svg>
+"""
+
+_STATIC = {
+    "/static/site.css": ("text/css", SITE_CSS),
+    "/static/site.js": ("application/javascript", SITE_JS),
+    "/static/logo.svg": ("image/svg+xml", LOGO_SVG),
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def _send(self, status: int, content_type: str, body: str, *, cacheable: bool = False) -> None:
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Cache-Control", "public, max-age=3600" if cacheable else "no-store")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self) -> None:
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+
+        if parsed.path == "/":
+            self._send(200, "text/html", INDEX_HTML)
+        elif parsed.path == "/dynamic":
+            self._send(200, "text/html", DYNAMIC_HTML)
+        elif parsed.path == "/search":
+            term = html.escape(query.get("q", [""])[0])
+            results = "".join(f"<li>{term} result {index}</li>" for index in range(1, 11))
+            self._send(200, "text/html", SEARCH_HTML.format(query=term, results=results))
+        elif parsed.path == "/api/items":
+            delay_ms = int(query.get("delay_ms", ["0"])[0])
+            time.sleep(delay_ms / 1000.0)
+            self._send(200, "application/json", json.dumps([f"Item {index}" for index in range(1, 6)]))
+        elif parsed.path in _STATIC:
+            content_type, body = _STATIC[parsed.path]
+            self._send(200, content_type, body, cacheable=True)
+        else:
+            self._send(404, "text/plain", "Not found")
+
+
+class LocalSite:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "LocalSite":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,262 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from benchmarks.fake_model import SCENARIOS, ScriptedGeminiClient
+from benchmarks.local_site import LocalSite
+from services.process_memory import process_tree_rss_bytes
+
+
+@dataclass
+class SessionResult:
+    started_at: float
+    finished_at: float = 0.0
+    session_at: float | None = None
+    action_at: list[float] = field(default_factory=list)
+    settle_ms: list[float] = field(default_factory=list)
+    sse_bytes: int = 0
+    events: dict[str, int] = field(default_factory=dict)
+    error: str | None = None
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def summarize(values: list[float]) -> dict[str, float]:
+    return {
+        "count": len(values),
+        "p50": round(percentile(values, 50), 1),
+        "p90": round(percentile(values, 90), 1),
+        "p99": round(percentile(values, 99), 1),
+        "max": round(max(values), 1) if values else 0.0,
+    }
+
+
+async def run_session(
+    service: Any,
+    *,
+    instruction: str,
+    include_screenshots: bool,
+    follow_ups: int = 0,
+) -> SessionResult:
+    result = SessionResult(started_at=time.perf_counter())
+    session_id: str | None = None
+    for round_index in range(1 + follow_ups):
+        message = instruction if round_index == 0 else f"{instruction} follow-up {round_index}"
+        session_id = await _run_instruction(
+            service,
+            result,
+            message=message,
+            session_id=session_id,
+            include_screenshots=include_screenshots,
+        )
+        if result.error:
+            break
+    result.finished_at = time.perf_counter()
+    return result
+
+
+async def _run_instruction(
+    service: Any,
+    result: SessionResult,
+    *,
+    message: str,
+    session_id: str | None,
+    include_screenshots: bool,
+) -> str | None:
+    async for chunk in service.stream_instruction(
+        message=message,
+        session_id=session_id,
+        max_turns=30,
+        include_screenshots=include_screenshots,
+    ):
+        now = time.perf_counter()
+        result.sse_bytes += len(chunk.encode("utf-8"))
+        header, _, body = chunk.partition("\n")
+        event = header.removeprefix("event: ").strip()
+        result.events[event] = result.events.get(event, 0) + 1
+        data = json.loads(body.removeprefix("data: ")) if body.strip() else {}
+
+        if event == "session":
+            session_id = data.get("session_id", session_id)
+            if result.session_at is None:
+                result.session_at = now
+        elif event == "action":
+            result.action_at.append(now)
+            if isinstance(data.get("settle_ms"), (int, float)):
+                result.settle_ms.append(float(data["settle_ms"]))
+        elif event == "error":
+            result.error = str(data.get("error", {}).get("message"))
+    return session_id
+
+
+async def sample_rss(peak: list[int], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        rss_bytes = await asyncio.to_thread(process_tree_rss_bytes)
+        if rss_bytes is not None:
+            peak[0] = max(peak[0], rss_bytes)
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=0.1)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    with LocalSite() as site:
+        # The service reads its configuration at construction time.
+        os.environ["PLAYWRIGHT_START_URL"] = f"{site.base_url}/"
+        os.environ["GEMINI_SEARCH_URL"] = f"{site.base_url}/search"
+        os.environ["GEMINI_SEARCH_QUERY_URL"] = f"{site.base_url}/search?q={{query}}"
+        from services.gemini_computer_use_service import GeminiComputerUseService
+
+        client = ScriptedGeminiClient(
+            scenario=SCENARIOS[args.scenario](site.base_url),
+            latency_ms=args.model_latency_ms,
+            chunk_delay_ms=args.chunk_delay_ms,
+        )
+        service = GeminiComputerUseService(genai_client=client)
+        peak_rss = [0]
+        stop_sampling = asyncio.Event()
+        sampler = asyncio.create_task(sample_rss(peak_rss, stop_sampling))
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def limited(index: int) -> tuple[str, SessionResult]:
+            instruction = f"benchmark {args.scenario} #{index}"
+            async with semaphore:
+                result = await run_session(
+                    service,
+                    instruction=instruction,
+                    include_screenshots=not args.metadata_only,
+                    follow_ups=args.follow_ups,
+                )
+            return instruction, result
+
+        try:
+            await service.start()
+            started_at = time.perf_counter()
+            runs = await asyncio.gather(*(limited(index) for index in range(args.sessions)))
+            elapsed_s = time.perf_counter() - started_at
+        finally:
+            stop_sampling.set()
+            await sampler
+            await service.close_all()
+
+    phases: dict[str, list[float]] = {
+        "session_setup": [],
+        "model_first_chunk": [],
+        "action": [],
+        "settle": [],
+        "run": [],
+    }
+    errors: list[str] = []
+    sse_bytes = 0
+    contents_sent = 0
+    contents_cached = 0
+    event_counts: dict[str, int] = {}
+    for instruction, result in runs:
+        sse_bytes += result.sse_bytes
+        for event, count in result.events.items():
+            event_counts[event] = event_counts.get(event, 0) + count
+        if result.error:
+            errors.append(result.error)
+        if result.session_at is not None:
+            phases["session_setup"].append((result.session_at - result.started_at) * 1000)
+        phases["run"].append((result.finished_at - result.started_at) * 1000)
+        phases["settle"].extend(result.settle_ms)
+
+        records = client.records.get(instruction, [])
+        call_times: list[float] = []
+        for record in records:
+            if record.first_chunk_at is not None:
+                phases["model_first_chunk"].append((record.first_chunk_at - record.started_at) * 1000)
+            call_times.extend(record.call_emitted_at)
+            contents_sent += record.sent_contents
+            contents_cached += record.cached_contents
+        # Each function call is answered by exactly one action event, in order.
+        for emitted_at, action_at in zip(call_times, result.action_at):
+            phases["action"].append((action_at - emitted_at) * 1000)
+
+    return {
+        "scenario": args.scenario,
+        "sessions": args.sessions,
+        "concurrency": args.concurrency,
+        "elapsed_s": round(elapsed_s, 3),
+        "sessions_per_s": round(args.sessions / elapsed_s, 3) if elapsed_s > 0 else 0.0,
+        "errors": errors,
+        "phases_ms": {name: summarize(values) for name, values in phases.items()},
+        "sse_bytes": sse_bytes,
+        "sse_bytes_per_session": sse_bytes // max(1, args.sessions),
+        "events": event_counts,
+        "peak_rss_mb": round(peak_rss[0] / (1024 * 1024), 1),
+        "context_cache": {
+            "created": len(client.created_caches),
+            "deleted": len(client.deleted_caches),
+            "contents_sent": contents_sent,
+            "contents_cached": contents_cached,
+        },
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print(
+        f"{report['sessions']} sessions ({report['scenario']}, concurrency {report['concurrency']}) "
+        f"in {report['elapsed_s']}s: {report['sessions_per_s']} sessions/s, "
+        f"{len(report['errors'])} errors"
+    )
+    print(f"{'phase (ms)':<20}{'count':>8}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+    for name, stats in report["phases_ms"].items():
+        print(
+            f"{name:<20}{stats['count']:>8}{stats['p50']:>10}{stats['p90']:>10}"
+            f"{stats['p99']:>10}{stats['max']:>10}"
+        )
+    print(f"SSE bytes: {report['sse_bytes']} total, {report['sse_bytes_per_session']} per session")
+    print(f"Events: {report['events']}")
+    print(f"Peak RSS (backend + Chromium): {report['peak_rss_mb']} MB")
+    cache = report["context_cache"]
+    print(
+        f"Context cache: {cache['created']} created, {cache['deleted']} deleted, "
+        f"{cache['contents_sent']} contents sent, {cache['contents_cached']} served from cache"
+    )
+    for error in report["errors"][:5]:
+        print(f"error: {error}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline agent-loop benchmark")
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), default="browse")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--model-latency-ms", type=float, default=200.0)
+    parser.add_argument("--chunk-delay-ms", type=float, default=20.0)
+    parser.add_argument(
+        "--metadata-only",
+        action="store_true",
+        help="Request include_screenshots=false, as the live-view UI does",
+    )
+    parser.add_argument(
+        "--follow-ups",
+        type=int,
+        default=0,
+        help="Further instructions per session; with GEMINI_CONTEXT_CACHE=true they use the cache",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_benchmark(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,14 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from dotenv import load_dotenv
 import os
 
-from routers import computer_use
-
-# Load environment variables
+# Load environment variables before the router builds the service, which reads them
 load_dotenv()
 
+from routers import computer_use  # noqa: E402
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Operator API",
@@ -33,6 +34,20 @@ app.add_middleware(
 app.include_router(computer_use.router, prefix="/api", tags=["gemini"])
 
 
+if os.getenv("METRICS_ENABLED", "true").strip().lower() in {"1", "true", "yes", "on"}:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> PlainTextResponse:
+        return PlainTextResponse(
+            computer_use.service.metrics.registry.render(),
+            media_type="text/plain; version=0.0.4",
+        )
+
+
+@app.on_event("startup")
+async def on_startup() -> None:
+    await computer_use.service.start()
+
+
 @app.on_event("shutdown")
 async def on_shutdown() -> None:
     await computer_use.service.close_all()
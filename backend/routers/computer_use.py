@@ -1,8 +1,16 @@
-from fastapi import APIRouter
-from fastapi.responses import StreamingResponse
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import RedirectResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
 
-from services.gemini_computer_use_service import GeminiComputerUseService
+from services.forwarding import FORWARDED_HEADER, WORKER_HEADER, SessionForwarder
+from services.gemini_computer_use_service import (
+    BatchJob,
+    GeminiComputerUseError,
+    GeminiComputerUseService,
+)
 
 router = APIRouter()
 service = GeminiComputerUseService()
@@ -15,30 +23,217 @@ class GeminiRequest(BaseModel):
     message: str = Field(..., min_length=1)
     session_id: str | None = None
     max_turns: int | None = Field(default=None, ge=1, le=30)
+    include_screenshots: bool = True
+
+
+class GeminiBatchJob(BaseModel):
+    class Config:
+        extra = "forbid"
+
+    message: str = Field(..., min_length=1)
+    session_id: str | None = None
+    start_url: str | None = None
+    max_turns: int | None = Field(default=None, ge=1, le=30)
+
+
+class GeminiBatchRequest(BaseModel):
+    class Config:
+        extra = "forbid"
+
+    jobs: list[GeminiBatchJob] = Field(..., min_length=1, max_length=100)
+    max_concurrency: int | None = Field(default=None, ge=1, le=64)
+    include_screenshots: bool = False
+    close_sessions: bool = True
 
 
 class CloseSessionResponse(BaseModel):
     closed: bool
 
 
+class StopRunResponse(BaseModel):
+    stopped: bool
+
+
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
+def _sse_headers() -> dict[str, str]:
+    if service.session_registry is None:
+        return _SSE_HEADERS
+    # Lets a load balancer pin a session's follow-ups to the worker that holds it.
+    return {**_SSE_HEADERS, WORKER_HEADER: service.worker_id}
+
+
+async def _route_to_owner(request: Request, session_ids: set[str]) -> Response | None:
+    # Requests already proxied once are served here, even if that means not found.
+    if not session_ids or request.headers.get(FORWARDED_HEADER):
+        return None
+    owners = {await service.session_owner(session_id) for session_id in session_ids}
+    if len(owners) != 1 or None in owners:
+        return None
+    owner = owners.pop()
+    if service.session_routing == "redirect":
+        return RedirectResponse(
+            service.owner_url(owner, request.url.path, request.url.query),
+            status_code=307,
+        )
+    try:
+        upstream = await service.forward(
+            owner,
+            method=request.method,
+            path=request.url.path,
+            query=request.url.query,
+            headers=dict(request.headers),
+            body=await request.body(),
+        )
+    except GeminiComputerUseError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.error) from exc
+    return StreamingResponse(
+        upstream.aiter_raw(),
+        status_code=upstream.status_code,
+        headers=SessionForwarder.response_headers(upstream),
+        background=BackgroundTask(upstream.aclose),
+    )
+
+
+def _check_admission() -> None:
+    # Reject before the stream starts so clients see a real 429.
+    try:
+        service.check_admission()
+    except GeminiComputerUseError as exc:
+        raise HTTPException(
+            status_code=exc.status_code,
+            detail=exc.error,
+            headers={"Retry-After": "1"},
+        ) from exc
+
+
 @router.post("/gemini")
-async def run_gemini(request: GeminiRequest):
+async def run_gemini(request: GeminiRequest, http_request: Request):
+    routed = await _route_to_owner(
+        http_request, {request.session_id} if request.session_id else set()
+    )
+    if routed is not None:
+        return routed
+    _check_admission()
     return StreamingResponse(
         service.stream_instruction(
             message=request.message,
             session_id=request.session_id,
             max_turns=request.max_turns,
+            include_screenshots=request.include_screenshots,
+        ),
+        media_type="text/event-stream",
+        headers=_sse_headers(),
+    )
+
+
+@router.post("/gemini/batch")
+async def run_gemini_batch(request: GeminiBatchRequest, http_request: Request):
+    # A batch is forwarded only when every session it names lives on one other worker.
+    routed = await _route_to_owner(
+        http_request, {job.session_id for job in request.jobs if job.session_id}
+    )
+    if routed is not None:
+        return routed
+    _check_admission()
+    return StreamingResponse(
+        service.stream_batch(
+            jobs=[BatchJob(**job.model_dump()) for job in request.jobs],
+            max_concurrency=request.max_concurrency,
+            include_screenshots=request.include_screenshots,
+            close_sessions=request.close_sessions,
         ),
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no",
-        },
+        headers=_sse_headers(),
     )
 
 
 @router.delete("/gemini/{session_id}", response_model=CloseSessionResponse)
-async def close_gemini_session(session_id: str):
+async def close_gemini_session(session_id: str, request: Request):
+    routed = await _route_to_owner(request, {session_id})
+    if routed is not None:
+        return routed
     closed = await service.close_session(session_id)
     return CloseSessionResponse(closed=closed)
+
+
+@router.post("/gemini/{session_id}/stop", response_model=StopRunResponse)
+async def stop_gemini_run(session_id: str, request: Request):
+    routed = await _route_to_owner(request, {session_id})
+    if routed is not None:
+        return routed
+    try:
+        stopped = service.stop_run(session_id)
+    except GeminiComputerUseError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.error) from exc
+    return StopRunResponse(stopped=stopped)
+
+
+@router.get("/gemini/{session_id}/frames/{seq}")
+async def get_gemini_frame(session_id: str, seq: int, request: Request):
+    routed = await _route_to_owner(request, {session_id})
+    if routed is not None:
+        return routed
+    try:
+        frame = service.get_frame(session_id, seq)
+    except GeminiComputerUseError as exc:
+        raise HTTPException(status_code=exc.status_code, detail=exc.error) from exc
+
+    # Frame URLs are never reused within a session, so clients may cache them forever.
+    headers = {
+        "ETag": f'"{frame.digest.hex()}"',
+        "Cache-Control": "private, max-age=31536000, immutable",
+    }
+    if request.headers.get("if-none-match") == headers["ETag"]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=frame.data, media_type=frame.mime_type, headers=headers)
+
+
+async def _wait_for_disconnect(websocket: WebSocket) -> None:
+    while True:
+        message = await websocket.receive()
+        if message["type"] == "websocket.disconnect":
+            return
+
+
+@router.websocket("/gemini/{session_id}/live")
+async def live_gemini_session(websocket: WebSocket, session_id: str):
+    # A close sent before the handshake completes reaches clients as an HTTP 403,
+    # not as one of the documented close codes.
+    await websocket.accept()
+    # WebSockets are not proxied; sticky routing has to land them on the owner.
+    if await service.session_owner(session_id) is not None:
+        await websocket.close(code=4409, reason="Session is held by another worker")
+        return
+    try:
+        frames = await service.subscribe_screencast(session_id)
+    except GeminiComputerUseError as exc:
+        await websocket.close(code=4000 + exc.status_code, reason=exc.error["message"][:120])
+        return
+
+    disconnected = asyncio.create_task(_wait_for_disconnect(websocket))
+    try:
+        while True:
+            next_frame = asyncio.create_task(frames.get())
+            done, _ = await asyncio.wait(
+                {next_frame, disconnected},
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if disconnected in done:
+                next_frame.cancel()
+                return
+            frame = next_frame.result()
+            if not frame:
+                await websocket.close(code=4410, reason="Session closed")
+                return
+            await websocket.send_bytes(frame)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        await service.unsubscribe_screencast(session_id, frames)
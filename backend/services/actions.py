@@ -0,0 +1,181 @@
+import asyncio
+import sys
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+from urllib.parse import quote_plus
+
+from playwright.async_api import Page
+
+Point = tuple[int, int]
+ActionHandler = Callable[[Page, dict[str, Any], list[Point]], Awaitable[None]]
+
+
+@dataclass(frozen=True)
+class ActionSpec:
+    name: str
+    handler: ActionHandler
+    # (x, y) argument pairs in the model's 0-999 space, mapped to viewport pixels.
+    points: tuple[tuple[str, str], ...] = ()
+    # String arguments that must be present and non-blank.
+    required_text: tuple[str, ...] = ()
+    # Settle strategy: "none", "interaction", or "navigation" for actions that load a page.
+    settle: str = "interaction"
+
+
+def to_int(value: Any, *, key: str) -> int:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"Missing or invalid numeric argument: {key}")
+    return int(value)
+
+
+class ActionExecutor:
+    def __init__(
+        self,
+        *,
+        viewport_width: int,
+        viewport_height: int,
+        search_url: str,
+        search_query_url: str,
+        insert_text_min_chars: int,
+    ) -> None:
+        self.viewport_width = viewport_width
+        self.viewport_height = viewport_height
+        self.search_url = search_url
+        self.search_query_url = search_query_url
+        self.insert_text_min_chars = insert_text_min_chars
+        self.actions = {
+            spec.name: spec
+            for spec in (
+                ActionSpec("open_web_browser", self._noop, settle="none"),
+                ActionSpec("wait_5_seconds", self._wait_5_seconds, settle="none"),
+                ActionSpec("go_back", self._go_back, settle="navigation"),
+                ActionSpec("go_forward", self._go_forward, settle="navigation"),
+                ActionSpec("search", self._search, settle="navigation"),
+                ActionSpec("navigate", self._navigate, required_text=("url",), settle="navigation"),
+                ActionSpec("click_at", self._click_at, points=(("x", "y"),)),
+                ActionSpec("hover_at", self._hover_at, points=(("x", "y"),)),
+                ActionSpec("type_text_at", self._type_text_at, points=(("x", "y"),)),
+                ActionSpec("key_combination", self._key_combination, required_text=("keys",)),
+                ActionSpec("scroll_document", self._scroll_document),
+                ActionSpec("scroll_at", self._scroll_at, points=(("x", "y"),)),
+                ActionSpec(
+                    "drag_and_drop",
+                    self._drag_and_drop,
+                    points=(("x", "y"), ("destination_x", "destination_y")),
+                ),
+            )
+        }
+
+    def get(self, name: str) -> ActionSpec | None:
+        return self.actions.get(name)
+
+    def denorm(self, x: int, y: int) -> Point:
+        x_px = int(x / 1000 * self.viewport_width)
+        y_px = int(y / 1000 * self.viewport_height)
+        return (
+            max(0, min(self.viewport_width - 1, x_px)),
+            max(0, min(self.viewport_height - 1, y_px)),
+        )
+
+    async def run(self, page: Page, spec: ActionSpec, args: dict[str, Any]) -> None:
+        for key in spec.required_text:
+            value = args.get(key)
+            if not isinstance(value, str) or not value.strip():
+                raise ValueError(f"Missing {spec.name}.{key}")
+        points = [
+            self.denorm(to_int(args.get(x_key), key=x_key), to_int(args.get(y_key), key=y_key))
+            for x_key, y_key in spec.points
+        ]
+        await spec.handler(page, args, points)
+
+    @staticmethod
+    async def _noop(page: Page, args: dict[str, Any], points: list[Point]) -> None:
+        pass
+
+    @staticmethod
+    async def _wait_5_seconds(page: Page, args: dict[str, Any], points: list[Point]) -> None:
+        await asyncio.sleep(5)
+
+    @staticmethod
+    async def _go_back(page: Page, args: dict[str, Any], points: list[Point]) -> None:
+        await page.go_back()
+
+    @staticmethod
+    async def _go_forward(page: Page, args: dict[str, Any], points: list[Point]) -> None:
+        await page.go_forward()
+
+    async def _search(self, page: Page, args: dict[str, Any], points: list[Point]) -> None:
+        query = args.get("query")
+        if not isinstance(query, str) or not query.strip():
+            await page.goto(self.search_url)
+            return
+        if "{query}" in self.search_query_url:
+            # One navigation straight to the results instead of load, type, submit, load.
+            await page.goto(self.search_query_url.replace("{query}", quote_plus(query.strip())))
+            return
+        await page.goto(self.search_url)
+        await page.keyboard.type(query.strip())
+        await page.keyboard.press("Enter")
+
+    @staticmethod
+    async def _navigate(page: Page, args: dict[str, Any], points: list[Point]) -> None:
+        await page.goto(args["url"].strip())
+
+    @staticmethod
+    async def _click_at(page: Page, args: dict[str, Any], points: list[Point]) -> None:
+        await page.mouse.click(*points[0])
+
+    @staticmethod
+    async def _hover_at(page: Page, args: dict[str, Any], points: list[Point]) -> None:
+        await page.mouse.move(*points[0])
+
+    async def _type_text_at(self, page: Page, args: dict[str, Any], points: list[Point]) -> None:
+        text = args.get("text")
+        if not isinstance(text, str):
+            raise ValueError("Missing type_text_at.text")
+        await page.mouse.click(*points[0])
+        if bool(args.get("clear_before_typing", True)):
+            select_all = "Meta+A" if sys.platform == "darwin" else "Control+A"
+            await page.keyboard.press(select_all)
+            await page.keyboard.press("Backspace")
+        if 0 < self.insert_text_min_chars <= len(text):
+            # One input event instead of a keydown/keypress/keyup round-trip per character.
+            await page.keyboard.insert_text(text)
+        else:
+            await page.keyboard.type(text)
+        if bool(args.get("press_enter", True)):
+            await page.keyboard.press("Enter")
+
+    @staticmethod
+    async def _key_combination(page: Page, args: dict[str, Any], points: list[Point]) -> None:
+        await page.keyboard.press(args["keys"].strip())
+
+    @staticmethod
+    async def _scroll_document(page: Page, args: dict[str, Any], points: list[Point]) -> None:
+        direction = str(args.get("direction", "down")).strip().lower()
+        if direction == "down":
+            await page.keyboard.press("PageDown")
+        elif direction == "up":
+            await page.keyboard.press("PageUp")
+        elif direction == "left":
+            await page.evaluate("window.scrollBy(-400, 0)")
+        elif direction == "right":
+            await page.evaluate("window.scrollBy(400, 0)")
+        else:
+            raise ValueError("Unsupported scroll direction")
+
+    @staticmethod
+    async def _scroll_at(page: Page, args: dict[str, Any], points: list[Point]) -> None:
+        magnitude = to_int(args.get("magnitude", 800), key="magnitude")
+        direction = str(args.get("direction", "down")).strip().lower()
+        dy = magnitude if direction == "down" else -magnitude
+        await page.mouse.move(*points[0])
+        await page.mouse.wheel(0, dy)
+
+    @staticmethod
+    async def _drag_and_drop(page: Page, args: dict[str, Any], points: list[Point]) -> None:
+        (sx, sy), (dx, dy) = points
+        await page.mouse.move(sx, sy)
+        await page.mouse.down()
+        await page.mouse.move(dx, dy, steps=10)
+        await page.mouse.up()
@@ -0,0 +1,124 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from playwright.async_api import Browser
+
+
+@dataclass(eq=False)
+class BrowserSlot:
+    index: int
+    browser: Browser | None = None
+    # Bumped on every (re)launch; contexts remember the generation they were born in.
+    generation: int = 0
+    contexts: int = 0
+    launches: int = 0
+    crashes: int = 0
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    @property
+    def healthy(self) -> bool:
+        return self.browser is not None and self.browser.is_connected()
+
+    def owns(self, generation: int) -> bool:
+        return self.generation == generation and self.healthy
+
+    def release(self, generation: int) -> None:
+        if generation == self.generation and self.contexts > 0:
+            self.contexts -= 1
+
+
+class BrowserPool:
+    def __init__(
+        self,
+        *,
+        size: int,
+        launch: Callable[[], Awaitable[Browser]],
+        health_interval_s: float,
+    ) -> None:
+        self.slots = [BrowserSlot(index=index) for index in range(max(1, size))]
+        self.health_interval_s = health_interval_s
+        self._launch = launch
+        self._closing = False
+        self._health_task: asyncio.Task[None] | None = None
+
+    async def _launch_slot(self, slot: BrowserSlot) -> Browser:
+        async with slot.lock:
+            if slot.healthy:
+                return slot.browser
+            browser = await self._launch()
+            slot.browser = browser
+            slot.generation += 1
+            slot.launches += 1
+            generation = slot.generation
+            browser.on("disconnected", lambda _: self._on_disconnected(slot, generation))
+            return browser
+
+    def _on_disconnected(self, slot: BrowserSlot, generation: int) -> None:
+        if self._closing or slot.generation != generation:
+            return
+        slot.crashes += 1
+        slot.browser = None
+        slot.contexts = 0
+        # Relaunch in the background so the next placement finds a live browser.
+        asyncio.get_running_loop().create_task(self._relaunch(slot))
+
+    async def _relaunch(self, slot: BrowserSlot) -> None:
+        backoff_s = 0.5
+        while not self._closing and not slot.healthy:
+            try:
+                await self._launch_slot(slot)
+            except Exception:
+                await asyncio.sleep(backoff_s)
+                backoff_s = min(10.0, backoff_s * 2)
+
+    async def start(self, *, launch: bool = True) -> None:
+        if launch:
+            await asyncio.gather(*(self._launch_slot(slot) for slot in self.slots))
+        if self._health_task is None and self.health_interval_s > 0:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def _health_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.health_interval_s)
+            for slot in self.slots:
+                if slot.browser is not None and not slot.browser.is_connected():
+                    self._on_disconnected(slot, slot.generation)
+
+    async def acquire(self) -> tuple[BrowserSlot, Browser]:
+        # Least-loaded placement; unlaunched or crashed slots are started on demand.
+        slot = min(self.slots, key=lambda candidate: (candidate.contexts, not candidate.healthy))
+        # Reserve before awaiting the launch so concurrent callers spread out.
+        slot.contexts += 1
+        try:
+            browser = await self._launch_slot(slot)
+        except Exception:
+            slot.contexts = max(0, slot.contexts - 1)
+            raise
+        return slot, browser
+
+    def stats(self) -> list[dict[str, int | bool]]:
+        return [
+            {
+                "index": slot.index,
+                "healthy": slot.healthy,
+                "contexts": slot.contexts,
+                "launches": slot.launches,
+                "crashes": slot.crashes,
+            }
+            for slot in self.slots
+        ]
+
+    async def close(self) -> None:
+        self._closing = True
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        for slot in self.slots:
+            browser, slot.browser = slot.browser, None
+            if browser is not None:
+                try:
+                    await browser.close()
+                except Exception:
+                    pass
+        self._closing = False
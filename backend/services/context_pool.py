@@ -0,0 +1,109 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+from playwright.async_api import BrowserContext, Page
+
+from services.browser_pool import BrowserSlot
+from services.request_router import RequestStats
+
+
+@dataclass
+class PooledContext:
+    context: BrowserContext
+    page: Page
+    slot: BrowserSlot
+    generation: int
+    requests: RequestStats = field(default_factory=RequestStats)
+
+    @property
+    def alive(self) -> bool:
+        return self.slot.owns(self.generation) and not self.page.is_closed()
+
+
+class ContextPool:
+    def __init__(
+        self,
+        *,
+        factory: Callable[[], Awaitable[PooledContext]],
+        min_size: int,
+        max_size: int,
+    ) -> None:
+        self.min_size = max(0, min_size)
+        self.max_size = max(self.min_size, max_size)
+        self.hits = 0
+        self.misses = 0
+        self._factory = factory
+        self._idle: deque[PooledContext] = deque()
+        self._target = self.min_size
+        self._wakeup = asyncio.Event()
+        self._refill_task: asyncio.Task[None] | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    @property
+    def size(self) -> int:
+        return len(self._idle)
+
+    def start(self) -> None:
+        if not self.enabled or self._refill_task is not None:
+            return
+        self._refill_task = asyncio.create_task(self._refill_loop())
+        self._wakeup.set()
+
+    def acquire(self) -> PooledContext | None:
+        pooled: PooledContext | None = None
+        while self._idle:
+            candidate = self._idle.popleft()
+            if candidate.alive:
+                pooled = candidate
+                break
+
+        if pooled is None:
+            # Demand outran the pool: keep more contexts warm, up to max_size.
+            self.misses += 1
+            self._target = min(self.max_size, self._target + 1)
+        else:
+            self.hits += 1
+            if len(self._idle) >= self._target:
+                self._target = max(self.min_size, self._target - 1)
+
+        self._wakeup.set()
+        return pooled
+
+    async def _refill_loop(self) -> None:
+        backoff_s = 0.5
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while len(self._idle) < self._target:
+                try:
+                    pooled = await self._factory()
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    # The browser may be restarting; retry later instead of spinning.
+                    await asyncio.sleep(backoff_s)
+                    backoff_s = min(10.0, backoff_s * 2)
+                    continue
+                backoff_s = 0.5
+                self._idle.append(pooled)
+
+    async def close(self) -> None:
+        if self._refill_task is not None:
+            self._refill_task.cancel()
+            try:
+                await self._refill_task
+            except asyncio.CancelledError:
+                pass
+            self._refill_task = None
+
+        while self._idle:
+            pooled = self._idle.popleft()
+            try:
+                await pooled.context.close()
+            except Exception:
+                pass
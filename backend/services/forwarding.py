@@ -0,0 +1,72 @@
+import httpx
+
+# Marks requests one worker proxied to another so they are never forwarded twice.
+FORWARDED_HEADER = "x-operator-forwarded"
+WORKER_HEADER = "X-Operator-Worker"
+_HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailer",
+    "transfer-encoding",
+    "upgrade",
+}
+
+
+def _forwardable(headers: dict[str, str], *, drop: set[str]) -> dict[str, str]:
+    return {
+        name: value
+        for name, value in headers.items()
+        if name.lower() not in _HOP_BY_HOP_HEADERS and name.lower() not in drop
+    }
+
+
+class SessionForwarder:
+    def __init__(self, *, connect_timeout_s: float) -> None:
+        self.connect_timeout_s = connect_timeout_s
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            # Runs stream for minutes; only the connect phase is bounded.
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(None, connect=self.connect_timeout_s),
+            )
+        return self._client
+
+    async def open(
+        self,
+        base_url: str,
+        *,
+        method: str,
+        path: str,
+        query: str,
+        headers: dict[str, str],
+        body: bytes,
+    ) -> httpx.Response:
+        url = f"{base_url.rstrip('/')}{path}"
+        if query:
+            url = f"{url}?{query}"
+        client = self._get_client()
+        request = client.build_request(
+            method,
+            url,
+            headers={
+                **_forwardable(headers, drop={"host", "content-length"}),
+                FORWARDED_HEADER: "1",
+            },
+            content=body,
+        )
+        return await client.send(request, stream=True)
+
+    @staticmethod
+    def response_headers(response: httpx.Response) -> dict[str, str]:
+        # Raw bytes are passed through, so the upstream encoding and length still hold.
+        return _forwardable(dict(response.headers), drop=set())
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
@@ -0,0 +1,167 @@
+import base64
+import hashlib
+import io
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+try:
+    from PIL import Image
+except ImportError:  # Pillow is optional; perceptual matching is skipped without it.
+    Image = None
+
+_FRAME_MIME_TYPES = {
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+}
+
+
+@dataclass(frozen=True)
+class FrameSpec:
+    format: str = "png"
+    quality: int | None = None
+    max_dimension: int | None = None
+    grayscale: bool = False
+
+    @classmethod
+    def parse(
+        cls,
+        raw_format: str | None,
+        raw_quality: str | None = None,
+        *,
+        raw_max_dimension: str | None = None,
+        grayscale: bool = False,
+    ) -> "FrameSpec":
+        frame_format = (raw_format or "png").strip().lower()
+        if frame_format == "jpg":
+            frame_format = "jpeg"
+        if frame_format not in _FRAME_MIME_TYPES:
+            raise ValueError(f"Unsupported frame format: {raw_format}")
+
+        quality: int | None = None
+        if frame_format != "png" and raw_quality is not None and raw_quality.strip():
+            quality = max(1, min(100, int(raw_quality)))
+
+        max_dimension: int | None = None
+        if raw_max_dimension is not None and raw_max_dimension.strip():
+            max_dimension = max(0, int(raw_max_dimension)) or None
+        return cls(
+            format=frame_format,
+            quality=quality,
+            max_dimension=max_dimension,
+            # Grayscale needs Pillow; without it frames stay in color.
+            grayscale=grayscale and Image is not None,
+        )
+
+    @property
+    def mime_type(self) -> str:
+        return _FRAME_MIME_TYPES[self.format]
+
+    def scale(self, width: int, height: int) -> float | None:
+        # Uniform scaling keeps normalized coordinates valid against the real viewport.
+        if self.max_dimension is None or max(width, height) <= self.max_dimension:
+            return None
+        return self.max_dimension / max(width, height)
+
+    def to_grayscale(self, frame: "Frame") -> "Frame":
+        if not self.grayscale:
+            return frame
+        output = io.BytesIO()
+        options: dict[str, int] = {} if self.quality is None else {"quality": self.quality}
+        with Image.open(io.BytesIO(frame.data)) as image:
+            image.convert("L").save(output, format=self.format.upper(), **options)
+        return Frame.from_bytes(output.getvalue(), mime_type=self.mime_type)
+
+
+@dataclass(eq=False)
+class Frame:
+    mime_type: str
+    _data: bytes | None = field(default=None, repr=False)
+    _data_base64: str | None = field(default=None, repr=False)
+    _digest: bytes | None = field(default=None, repr=False)
+    _perceptual_hash: int | None = field(default=None, repr=False)
+
+    @classmethod
+    def from_bytes(cls, data: bytes, *, mime_type: str) -> "Frame":
+        return cls(mime_type=mime_type, _data=data)
+
+    @classmethod
+    def from_base64(cls, data_base64: str, *, mime_type: str) -> "Frame":
+        return cls(mime_type=mime_type, _data_base64=data_base64)
+
+    @property
+    def data(self) -> bytes:
+        if self._data is None:
+            self._data = base64.b64decode(self._data_base64 or "")
+        return self._data
+
+    @property
+    def base64(self) -> str:
+        if self._data_base64 is None:
+            self._data_base64 = base64.b64encode(self._data or b"").decode("ascii")
+        return self._data_base64
+
+    @property
+    def size(self) -> int:
+        return len(self.data)
+
+    @property
+    def digest(self) -> bytes:
+        if self._digest is None:
+            self._digest = hashlib.blake2b(self.data, digest_size=16).digest()
+        return self._digest
+
+    @property
+    def perceptual_hash(self) -> int | None:
+        # 64-bit difference hash over a 9x8 grayscale thumbnail.
+        if self._perceptual_hash is None and Image is not None:
+            try:
+                with Image.open(io.BytesIO(self.data)) as image:
+                    pixels = list(image.convert("L").resize((9, 8)).getdata())
+            except Exception:
+                return None
+            value = 0
+            for row in range(8):
+                for column in range(8):
+                    left = pixels[row * 9 + column]
+                    right = pixels[row * 9 + column + 1]
+                    value = (value << 1) | int(left > right)
+            self._perceptual_hash = value
+        return self._perceptual_hash
+
+    def matches(self, other: "Frame | None", *, perceptual_distance: int = -1) -> bool:
+        if other is None or other.mime_type != self.mime_type:
+            return False
+        if other.digest == self.digest:
+            return True
+        if perceptual_distance < 0:
+            return False
+        own_hash = self.perceptual_hash
+        other_hash = other.perceptual_hash
+        if own_hash is None or other_hash is None:
+            return False
+        return bin(own_hash ^ other_hash).count("1") <= perceptual_distance
+
+
+class FrameRing:
+    # Recent UI frames by sequence number; sequence numbers are never reused
+    # within a session, so a frame URL can be cached as immutable.
+    def __init__(self, capacity: int = 16, *, next_seq: int = 1) -> None:
+        self.capacity = max(1, capacity)
+        self.next_seq = next_seq
+        self._frames: OrderedDict[int, Frame] = OrderedDict()
+
+    def add(self, frame: Frame) -> int:
+        if self._frames:
+            last_seq, last_frame = next(reversed(self._frames.items()))
+            if last_frame is frame:
+                return last_seq
+        seq = self.next_seq
+        self.next_seq += 1
+        self._frames[seq] = frame
+        while len(self._frames) > self.capacity:
+            self._frames.popitem(last=False)
+        return seq
+
+    def get(self, seq: int) -> Frame | None:
+        return self._frames.get(seq)
@@ -1,16 +1,74 @@
 import asyncio
-import base64
-import json
+import logging
 import os
-import sys
+import socket
+import statistics
 import time
 import uuid
+from collections import OrderedDict
+from contextlib import aclosing, asynccontextmanager
 from dataclasses import dataclass, field
+from functools import partial
 from typing import Any, AsyncIterator
 
+import httpx
 from google import genai
 from google.genai import types
-from playwright.async_api import Browser, BrowserContext, Page, Playwright, async_playwright
+from playwright.async_api import (
+    Browser,
+    BrowserContext,
+    CDPSession,
+    Page,
+    Playwright,
+    async_playwright,
+)
+
+from services.actions import ActionExecutor
+from services.browser_pool import BrowserPool, BrowserSlot
+from services.context_pool import ContextPool, PooledContext
+from services.forwarding import SessionForwarder
+from services.frames import Frame, FrameRing, FrameSpec
+from services.history import ConversationHistory
+from services.http_cache import HttpCache
+from services.metrics import OperatorMetrics, PhaseTimings
+from services.process_memory import process_tree_rss_bytes
+from services.request_router import RequestRouter, RequestStats
+from services.scheduler import FairLimiter, QueueFull, Ticket, backoff_delay_s
+from services.screencast import Screencast
+from services.session_registry import SessionOwner, open_session_registry
+from services.session_store import SessionSnapshot, SessionStore
+from services.settle import DOM_MUTATION_SCRIPT, NetworkTracker, SettleEngine
+from services.trajectories import (
+    TrajectoryRecorder,
+    TrajectoryReplay,
+    TrajectoryStep,
+    TrajectoryStore,
+)
+from services.workers import WorkerPool, dumps, monitor_loop_lag
+
+logger = logging.getLogger(__name__)
+
+# Events a run may queue ahead of its client; inline frames make each one large.
+_RUN_EVENT_BUFFER = 4
+_FINAL_RUN_EVENTS = {"done", "error"}
+
+# Registry rows of workers silent this long are dropped.
+_REGISTRY_PRUNE_AFTER_S = 3600.0
+
+# Diagnostics for the UI that the model has no use for.
+_SCREENSHOT_PAYLOAD_KEYS = {
+    "screenshot_base64",
+    "screenshot_id",
+    "screenshot_url",
+    "screenshot_mime_type",
+}
+_UI_ONLY_PAYLOAD_KEYS = {
+    *_SCREENSHOT_PAYLOAD_KEYS,
+    "screenshot_unchanged",
+    "settle_strategy",
+    "settle_ms",
+    "settle_timed_out",
+}
 
 
 @dataclass
@@ -19,19 +77,51 @@ class GeminiComputerUseError(Exception):
     error: dict[str, Any]
 
 
+@dataclass
+class RunEvent:
+    event: str
+    data: dict[str, Any]
+    timings: PhaseTimings | None = None
+
+
+@dataclass
+class BatchJob:
+    message: str
+    session_id: str | None = None
+    start_url: str | None = None
+    max_turns: int | None = None
+
+
 @dataclass
 class BrowserSession:
     session_id: str
     context: BrowserContext
     page: Page
+    browser_slot: BrowserSlot
+    browser_generation: int
     lock: asyncio.Lock = field(default_factory=asyncio.Lock)
-    last_screenshot_base64: str | None = None
+    network: NetworkTracker = field(default_factory=NetworkTracker)
+    requests: RequestStats = field(default_factory=RequestStats)
+    frames: FrameRing = field(default_factory=FrameRing)
+    history: ConversationHistory | None = None
+    context_cache: str | None = None
+    cdp: CDPSession | None = None
+    screencast: Screencast | None = None
+    model_frame: Frame | None = None
+    model_frame_unchanged: bool = False
+    ui_frame: Frame | None = None
+    ui_bytes_saved: int = 0
+    model_bytes_saved: int = 0
     last_url: str = "about:blank"
     updated_at_ms: int = 0
+    restored: bool = False
+    closed: bool = False
+    run_task: asyncio.Task[Any] | None = None
+    stop_reason: str | None = None
 
 
 class GeminiComputerUseService:
-    def __init__(self) -> None:
+    def __init__(self, *, genai_client: Any | None = None) -> None:
         self.model = os.getenv(
             "GEMINI_COMPUTER_USE_MODEL",
             "gemini-2.5-computer-use-preview-10-2025",
@@ -40,7 +130,70 @@ class GeminiComputerUseService:
         self.viewport_height = int(os.getenv("PLAYWRIGHT_VIEWPORT_HEIGHT", "900"))
         self.start_url = os.getenv("PLAYWRIGHT_START_URL", "https://www.google.com")
         self.max_turns = int(os.getenv("GEMINI_COMPUTER_USE_MAX_TURNS", "10"))
-        self.action_settle_ms = int(os.getenv("PLAYWRIGHT_ACTION_SETTLE_MS", "600"))
+        self.history_max_screenshots = int(os.getenv("GEMINI_HISTORY_MAX_SCREENSHOTS", "3"))
+        self.session_history_instructions = int(
+            os.getenv("GEMINI_SESSION_HISTORY_INSTRUCTIONS", "5")
+        )
+        self.context_cache_enabled = (
+            os.getenv("GEMINI_CONTEXT_CACHE", "false").strip().lower()
+            in {"1", "true", "yes", "on"}
+        )
+        self.context_cache_ttl_s = int(os.getenv("GEMINI_CONTEXT_CACHE_TTL_S", "600"))
+        self.actions = ActionExecutor(
+            viewport_width=self.viewport_width,
+            viewport_height=self.viewport_height,
+            search_url=os.getenv("GEMINI_SEARCH_URL", "https://www.google.com").strip(),
+            search_query_url=os.getenv(
+                "GEMINI_SEARCH_QUERY_URL", "https://www.google.com/search?q={query}"
+            ).strip(),
+            insert_text_min_chars=int(os.getenv("PLAYWRIGHT_INSERT_TEXT_MIN_CHARS", "16")),
+        )
+        self.settle = SettleEngine(
+            mode=os.getenv("PLAYWRIGHT_SETTLE_MODE", "adaptive").strip().lower(),
+            fixed_ms=int(os.getenv("PLAYWRIGHT_ACTION_SETTLE_MS", "600")),
+            quiet_ms=int(os.getenv("PLAYWRIGHT_SETTLE_QUIET_MS", "300")),
+            max_ms=int(os.getenv("PLAYWRIGHT_SETTLE_MAX_MS", "5000")),
+            check_frames=(
+                os.getenv("PLAYWRIGHT_SETTLE_FRAME_CHECK", "false").strip().lower()
+                in {"1", "true", "yes", "on"}
+            ),
+        )
+        self.model_frame_spec = FrameSpec.parse(
+            os.getenv("GEMINI_FRAME_FORMAT", "png"),
+            os.getenv("GEMINI_FRAME_QUALITY"),
+            raw_max_dimension=os.getenv("GEMINI_FRAME_MAX_DIMENSION"),
+            grayscale=(
+                os.getenv("GEMINI_FRAME_GRAYSCALE", "false").strip().lower()
+                in {"1", "true", "yes", "on"}
+            ),
+        )
+        self.ui_frame_spec = FrameSpec.parse(
+            os.getenv("PLAYWRIGHT_UI_FRAME_FORMAT", "png"),
+            os.getenv("PLAYWRIGHT_UI_FRAME_QUALITY"),
+        )
+        # "reference" sends frame URLs over SSE instead of inline base64.
+        self.frame_delivery = os.getenv("PLAYWRIGHT_UI_FRAME_DELIVERY", "inline").strip().lower()
+        self.frame_history = int(os.getenv("PLAYWRIGHT_UI_FRAME_HISTORY", "16"))
+        self.screencast_max_fps = float(os.getenv("PLAYWRIGHT_SCREENCAST_MAX_FPS", "10"))
+        self.screencast_quality = int(os.getenv("PLAYWRIGHT_SCREENCAST_QUALITY", "60"))
+        self.frame_perceptual_distance = int(os.getenv("PLAYWRIGHT_FRAME_PERCEPTUAL_DISTANCE", "-1"))
+        self.omit_duplicate_model_frames = (
+            os.getenv("GEMINI_DUPLICATE_FRAMES", "omit").strip().lower() == "omit"
+        )
+        self.stream_model_output = (
+            os.getenv("GEMINI_STREAM_RESPONSES", "true").strip().lower()
+            in {"1", "true", "yes", "on"}
+        )
+        self.trajectory_mode = os.getenv("GEMINI_TRAJECTORY_MODE", "off").strip().lower()
+        if self.trajectory_mode not in {"off", "record", "replay"}:
+            raise ValueError(f"Unsupported trajectory mode: {self.trajectory_mode}")
+        self.trajectory_frame_distance = int(os.getenv("GEMINI_TRAJECTORY_FRAME_DISTANCE", "-1"))
+        self.trajectories = TrajectoryStore(os.getenv("GEMINI_TRAJECTORY_DIR", ".trajectories"))
+        self.batch_max_concurrency = int(os.getenv("GEMINI_BATCH_MAX_CONCURRENCY", "8"))
+        self.timing_events = (
+            os.getenv("GEMINI_TIMING_EVENTS", "false").strip().lower()
+            in {"1", "true", "yes", "on"}
+        )
         self.auto_approve_risky_actions = (
             os.getenv("GEMINI_AUTO_APPROVE_RISKY_ACTIONS", "false").strip().lower()
             in {"1", "true", "yes", "on"}
@@ -49,16 +202,177 @@ class GeminiComputerUseService:
             os.getenv("PLAYWRIGHT_HEADLESS", "true").strip().lower()
             in {"1", "true", "yes", "on"}
         )
+        self.eager_launch = (
+            os.getenv("PLAYWRIGHT_EAGER_LAUNCH", "true").strip().lower()
+            in {"1", "true", "yes", "on"}
+        )
+        self.session_idle_ttl_s = float(os.getenv("GEMINI_SESSION_IDLE_TTL_S", "900"))
+        self.max_sessions = int(os.getenv("GEMINI_MAX_SESSIONS", "50"))
+        self.rss_budget_bytes = int(os.getenv("PLAYWRIGHT_RSS_BUDGET_MB", "0")) * 1024 * 1024
+        self.reap_interval_s = float(os.getenv("GEMINI_SESSION_REAP_INTERVAL_S", "30"))
+        session_spill_dir = os.getenv("GEMINI_SESSION_SPILL_DIR", "").strip()
+        self.session_store = SessionStore(session_spill_dir) if session_spill_dir else None
+        self.session_spill_ttl_s = float(os.getenv("GEMINI_SESSION_SPILL_TTL_S", "604800"))
+        session_registry = os.getenv("GEMINI_SESSION_REGISTRY", "").strip()
+        self.session_registry = open_session_registry(session_registry) if session_registry else None
+        self.worker_id = (
+            os.getenv("GEMINI_WORKER_ID", "").strip() or f"{socket.gethostname()}-{os.getpid()}"
+        )
+        # Address other workers use to reach this one; each worker needs its own.
+        self.worker_url = (
+            os.getenv("GEMINI_WORKER_URL", "").strip()
+            or f"http://127.0.0.1:{os.getenv('PORT', '8000')}"
+        )
+        self.worker_heartbeat_s = float(os.getenv("GEMINI_WORKER_HEARTBEAT_S", "5"))
+        self.owner_stale_after_s = max(3 * self.worker_heartbeat_s, 1.0)
+        self.session_routing = os.getenv("GEMINI_SESSION_ROUTING", "forward").strip().lower()
+        if self.session_routing not in {"forward", "redirect"}:
+            raise ValueError(f"Unsupported session routing: {self.session_routing}")
+        self.forwarder = SessionForwarder(connect_timeout_s=5.0)
+        self.recreate_crashed_sessions = (
+            os.getenv("PLAYWRIGHT_RECREATE_CRASHED_SESSIONS", "true").strip().lower()
+            in {"1", "true", "yes", "on"}
+        )
+        self.provider_max_retries = int(os.getenv("GEMINI_PROVIDER_MAX_RETRIES", "3"))
+        self.provider_retry_base_s = int(os.getenv("GEMINI_PROVIDER_RETRY_BASE_MS", "500")) / 1000.0
+        self.provider_retry_cap_s = 8.0
+        browser_count = int(os.getenv("PLAYWRIGHT_BROWSER_COUNT", "1"))
+        browser_health_interval_s = float(os.getenv("PLAYWRIGHT_BROWSER_HEALTH_INTERVAL_S", "10"))
+        pool_min = int(os.getenv("PLAYWRIGHT_CONTEXT_POOL_MIN", "0"))
+        pool_max = int(os.getenv("PLAYWRIGHT_CONTEXT_POOL_MAX", str(max(pool_min, 4))))
 
-        self._genai_client: genai.Client | None = None
+        # Tests and benchmarks inject a stand-in exposing the same client.aio surface.
+        self._genai_client: Any | None = genai_client
         self._playwright: Playwright | None = None
-        self._browser: Browser | None = None
+        self._browser_pool = BrowserPool(
+            size=browser_count,
+            launch=self._launch_browser,
+            health_interval_s=browser_health_interval_s,
+        )
         self._sessions: dict[str, BrowserSession] = {}
+        self._evicted: OrderedDict[str, str] = OrderedDict()
+        self._restore_locks: dict[str, asyncio.Lock] = {}
+        self._reaper_task: asyncio.Task[None] | None = None
+        self.workers = WorkerPool(int(os.getenv("GEMINI_ENCODE_WORKERS", "4")))
+        self.loop_lag_interval_s = float(os.getenv("METRICS_LOOP_LAG_INTERVAL_MS", "250")) / 1000.0
+        self._loop_lag_task: asyncio.Task[None] | None = None
+        self._heartbeat_task: asyncio.Task[None] | None = None
         self._state_lock = asyncio.Lock()
+        self._room_lock = asyncio.Lock()
+        self._reserved_sessions = 0
+        self._queued_runs = 0
+        self._run_limiter = FairLimiter(
+            int(os.getenv("GEMINI_MAX_ACTIVE_RUNS", "16")),
+            max_waiters=int(os.getenv("GEMINI_MAX_QUEUED_RUNS", "64")),
+        )
+        self._model_limiter = FairLimiter(int(os.getenv("GEMINI_MAX_CONCURRENT_MODEL_CALLS", "8")))
+        self._create_limiter = FairLimiter(
+            int(os.getenv("PLAYWRIGHT_MAX_CONCURRENT_SESSION_CREATES", "4"))
+        )
+        self._context_pool = ContextPool(
+            factory=self._new_pooled_context,
+            min_size=pool_min,
+            max_size=pool_max if pool_min > 0 else 0,
+        )
+        self.metrics = OperatorMetrics()
+        self._register_gauges()
+        http_cache_dir = os.getenv("PLAYWRIGHT_HTTP_CACHE_DIR", "").strip()
+        self.request_router = RequestRouter(
+            blocked_resource_types=os.getenv("PLAYWRIGHT_BLOCK_RESOURCE_TYPES"),
+            blocked_domains=os.getenv("PLAYWRIGHT_BLOCK_DOMAINS"),
+            cache=(
+                HttpCache(
+                    http_cache_dir,
+                    max_bytes=int(os.getenv("PLAYWRIGHT_HTTP_CACHE_MAX_MB", "256")) * 1024 * 1024,
+                    default_ttl_s=int(os.getenv("PLAYWRIGHT_HTTP_CACHE_TTL_S", "3600")),
+                )
+                if http_cache_dir
+                else None
+            ),
+            metrics=self.metrics,
+        )
+
+    def _register_gauges(self) -> None:
+        registry = self.metrics.registry
+        registry.gauge(
+            "operator_active_sessions",
+            "Open browser sessions.",
+            lambda: len(self._sessions),
+        )
+        registry.gauge(
+            "operator_running_sessions",
+            "Sessions currently executing an instruction.",
+            lambda: sum(1 for session in self._sessions.values() if session.lock.locked()),
+        )
+        registry.gauge(
+            "operator_queued_runs",
+            "Instructions waiting for their session to become free.",
+            lambda: self._queued_runs,
+        )
+        registry.gauge(
+            "operator_active_runs",
+            "Instructions admitted by the scheduler.",
+            lambda: self._run_limiter.in_use,
+        )
+        registry.gauge(
+            "operator_admission_queue_depth",
+            "Instructions waiting for an admission slot.",
+            lambda: self._run_limiter.waiting,
+        )
+        registry.gauge(
+            "operator_model_calls_in_flight",
+            "Model requests currently open.",
+            lambda: self._model_limiter.in_use,
+        )
+        registry.gauge(
+            "operator_model_call_queue_depth",
+            "Model requests waiting for a concurrency slot.",
+            lambda: self._model_limiter.waiting,
+        )
+        registry.gauge(
+            "operator_context_pool_size",
+            "Warm browser contexts ready for new sessions.",
+            lambda: self._context_pool.size,
+        )
+        registry.gauge(
+            "operator_browsers_healthy",
+            "Connected Chromium processes.",
+            lambda: sum(1 for slot in self._browser_pool.slots if slot.healthy),
+        )
+        registry.gauge(
+            "operator_browser_contexts",
+            "Browser contexts open across all Chromium processes.",
+            lambda: sum(slot.contexts for slot in self._browser_pool.slots),
+        )
+        registry.gauge(
+            "operator_browser_crashes",
+            "Chromium processes lost since startup.",
+            lambda: sum(slot.crashes for slot in self._browser_pool.slots),
+        )
 
     @staticmethod
     def _sse_event(event: str, data: dict[str, Any]) -> str:
-        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=True)}\n\n"
+        return f"event: {event}\ndata: {dumps(data)}\n\n"
+
+    async def _emit(
+        self,
+        event: str,
+        data: dict[str, Any],
+        timings: PhaseTimings | None = None,
+    ) -> str:
+        started_at = time.perf_counter()
+        if "screenshot_base64" in data:
+            # Inline frames make multi-megabyte payloads; serialize them off the loop.
+            payload = await self.workers.run(self._sse_event, event, data)
+        else:
+            payload = self._sse_event(event, data)
+        elapsed = time.perf_counter() - started_at
+        if timings is not None:
+            timings.add("encode", elapsed)
+        self.metrics.encode_seconds.observe(elapsed)
+        self.metrics.sse_events.inc(event=event)
+        self.metrics.sse_bytes.inc(len(payload))
+        return payload
 
     @staticmethod
     def _now_ms() -> int:
@@ -72,7 +386,9 @@ class GeminiComputerUseService:
             "type": error_type,
         }
 
-    def _get_client(self) -> genai.Client:
+    def _get_client(self) -> Any:
+        if self._genai_client is not None:
+            return self._genai_client
         api_key = os.getenv("GEMINI_API_KEY")
         if not api_key:
             raise GeminiComputerUseError(
@@ -83,82 +399,554 @@ class GeminiComputerUseService:
                     error_type="configuration_error",
                 ),
             )
-        if self._genai_client is None:
-            self._genai_client = genai.Client(api_key=api_key)
+        self._genai_client = genai.Client(api_key=api_key)
         return self._genai_client
 
-    async def _ensure_browser(self) -> Browser:
+    async def _launch_browser(self) -> Browser:
         async with self._state_lock:
-            if self._browser is not None:
-                return self._browser
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+        return await self._playwright.chromium.launch(headless=self.headless)
 
-            self._playwright = await async_playwright().start()
-            self._browser = await self._playwright.chromium.launch(headless=self.headless)
-            return self._browser
+    async def start(self) -> None:
+        await self._browser_pool.start(launch=self.eager_launch)
+        self._context_pool.start()
+        if self._reaper_task is None and self.reap_interval_s > 0:
+            self._reaper_task = asyncio.create_task(self._reap_sessions_loop())
+        if self._loop_lag_task is None and self.loop_lag_interval_s > 0:
+            self._loop_lag_task = asyncio.create_task(
+                monitor_loop_lag(self.metrics, self.loop_lag_interval_s)
+            )
+        if self._heartbeat_task is None and self.session_registry is not None:
+            # Register before serving so sessions claimed right away are routable.
+            await self.session_registry.heartbeat(self.worker_id, self.worker_url)
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
 
-    async def _create_session(self) -> BrowserSession:
-        browser = await self._ensure_browser()
-        session_id = str(uuid.uuid4())
-        context = await browser.new_context(
-            viewport={"width": self.viewport_width, "height": self.viewport_height}
+    async def _new_pooled_context(
+        self,
+        *,
+        storage_state: dict[str, Any] | None = None,
+        url: str | None = None,
+    ) -> PooledContext:
+        slot, browser = await self._browser_pool.acquire()
+        generation = slot.generation
+        try:
+            context = await browser.new_context(
+                viewport={"width": self.viewport_width, "height": self.viewport_height},
+                storage_state=storage_state,
+            )
+        except Exception:
+            slot.release(generation)
+            raise
+        context.on("close", lambda _: slot.release(generation))
+        requests = RequestStats()
+        try:
+            await self.request_router.install(context, requests)
+            await context.add_init_script(DOM_MUTATION_SCRIPT)
+            page = await context.new_page()
+            await page.goto(url or self.start_url)
+        except Exception:
+            await context.close()
+            raise
+        return PooledContext(
+            context=context,
+            page=page,
+            slot=slot,
+            generation=generation,
+            requests=requests,
         )
-        page = await context.new_page()
-        await page.goto(self.start_url)
 
-        session = BrowserSession(session_id=session_id, context=context, page=page)
-        await self._capture_state(session)
+    async def _create_session(self, snapshot: SessionSnapshot | None = None) -> BrowserSession:
+        await self._make_room_for_session()
+        try:
+            # Restored sessions need their own storage state, so they skip the warm pool.
+            pooled = self._context_pool.acquire() if snapshot is None else None
+            if pooled is None:
+                async with self._create_limiter.slot(None):
+                    pooled = await self._new_pooled_context(
+                        storage_state=snapshot.storage_state if snapshot else None,
+                        url=snapshot.url if snapshot else None,
+                    )
+
+            # stream_instruction captures the first frame, so none is taken here.
+            session_id = snapshot.session_id if snapshot else str(uuid.uuid4())
+            session = BrowserSession(
+                session_id=session_id,
+                context=pooled.context,
+                page=pooled.page,
+                browser_slot=pooled.slot,
+                browser_generation=pooled.generation,
+                requests=pooled.requests,
+                frames=FrameRing(
+                    self.frame_history,
+                    next_seq=snapshot.frame_seq if snapshot else 1,
+                ),
+                updated_at_ms=self._now_ms(),
+            )
+            if snapshot is not None:
+                if snapshot.frame_base64 and snapshot.frame_mime_type:
+                    session.model_frame = Frame.from_base64(
+                        snapshot.frame_base64, mime_type=snapshot.frame_mime_type
+                    )
+                session.last_url = snapshot.url
+                session.ui_bytes_saved = snapshot.ui_bytes_saved
+                session.model_bytes_saved = snapshot.model_bytes_saved
+                if snapshot.history:
+                    session.history = ConversationHistory(
+                        max_screenshots=self.history_max_screenshots,
+                        contents=[types.Content.model_validate(raw) for raw in snapshot.history],
+                    )
+                session.restored = True
+            session.network.attach(session.page)
+        finally:
+            self._reserved_sessions -= 1
         self._sessions[session_id] = session
+        if snapshot is None:
+            await self._claim_session(session_id)
         return session
 
+    @staticmethod
+    def _session_crashed(session: BrowserSession) -> bool:
+        return not session.browser_slot.owns(session.browser_generation) or session.page.is_closed()
+
+    @classmethod
+    def _crashed_error(cls, session_id: str) -> GeminiComputerUseError:
+        return GeminiComputerUseError(
+            status_code=503,
+            error=cls._normalize_error(
+                status_code=503,
+                message=f"The browser hosting session {session_id} crashed; start a new session.",
+                error_type="session_crashed",
+            ),
+        )
+
+    async def _recover_session(self, session: BrowserSession) -> bool:
+        if not self._session_crashed(session):
+            return False
+        if not self.recreate_crashed_sessions:
+            await self._forget_session(session, "browser_crash")
+            raise self._crashed_error(session.session_id)
+
+        try:
+            await session.context.close()
+        except Exception:
+            pass
+        # A fresh context lands on a healthy browser; reopen the last known page there.
+        pooled = self._context_pool.acquire()
+        if pooled is None:
+            pooled = await self._new_pooled_context()
+        session.context = pooled.context
+        session.page = pooled.page
+        session.browser_slot = pooled.slot
+        session.browser_generation = pooled.generation
+        session.requests = pooled.requests
+        session.network = NetworkTracker()
+        session.network.attach(session.page)
+        session.cdp = None
+        if session.screencast is not None:
+            await session.screencast.bind(session.page)
+        if session.last_url not in {"about:blank", session.page.url}:
+            try:
+                await session.page.goto(session.last_url)
+            except Exception:
+                pass
+        return True
+
+    def _evicted_error(self, session_id: str) -> GeminiComputerUseError:
+        reason = self._evicted.get(session_id, "closed")
+        return GeminiComputerUseError(
+            status_code=410,
+            error=self._normalize_error(
+                status_code=410,
+                message=f"Session {session_id} was evicted ({reason}); start a new session.",
+                error_type="session_evicted",
+            ),
+        )
+
+    def _idle_sessions_lru(self) -> list[BrowserSession]:
+        # Sessions holding their lock are mid-run and never evicted.
+        idle = [session for session in self._sessions.values() if not session.lock.locked()]
+        return sorted(idle, key=lambda session: session.updated_at_ms)
+
+    async def _forget_session(self, session: BrowserSession, reason: str) -> None:
+        self._sessions.pop(session.session_id, None)
+        self.metrics.sessions_evicted.inc(reason=reason)
+        self._evicted[session.session_id] = reason
+        while len(self._evicted) > 1024:
+            self._evicted.popitem(last=False)
+        session.closed = True
+        await self._release_session(session.session_id)
+
+    @staticmethod
+    async def _close_browser_session(session: BrowserSession) -> None:
+        session.closed = True
+        if session.screencast is not None:
+            await session.screencast.close()
+        try:
+            await session.context.close()
+        except Exception:
+            pass
+
+    def _spilled(self, session_id: str) -> bool:
+        return self.session_store is not None and self.session_store.contains(session_id)
+
+    async def _spill_session(self, session: BrowserSession) -> bool:
+        if self.session_store is None or self._session_crashed(session):
+            return False
+        frame = session.model_frame
+        history = session.history
+        if history is not None:
+            # Screenshots are retaken on the next run; keep the snapshot small.
+            history.stub_images()
+        try:
+            frame_base64 = await self.workers.run(lambda: frame.base64) if frame else None
+            snapshot = SessionSnapshot(
+                session_id=session.session_id,
+                url=session.page.url or session.last_url,
+                storage_state=await session.context.storage_state(),
+                frame_mime_type=frame.mime_type if frame else None,
+                frame_base64=frame_base64,
+                ui_bytes_saved=session.ui_bytes_saved,
+                model_bytes_saved=session.model_bytes_saved,
+                updated_at_ms=session.updated_at_ms,
+                spilled_at_ms=self._now_ms(),
+                frame_seq=session.frames.next_seq,
+                history=[
+                    content.model_dump(mode="json", exclude_none=True)
+                    for content in (history.contents if history else [])
+                ],
+            )
+            await self.session_store.save(snapshot)
+        except Exception:
+            return False
+        return True
+
+    async def _restore_session(self, session_id: str) -> None:
+        lock = self._restore_locks.setdefault(session_id, asyncio.Lock())
+        try:
+            async with lock:
+                if session_id in self._sessions or self.session_store is None:
+                    return
+                # With a shared spill directory, another worker may be restoring it too.
+                if not await self._claim_session(session_id):
+                    return
+                snapshot = await self.session_store.load(session_id)
+                if snapshot is None:
+                    await self._release_session(session_id)
+                    return
+                try:
+                    await self._create_session(snapshot)
+                except BaseException:
+                    # Other workers would keep routing the session here otherwise.
+                    await self._release_session(session_id)
+                    raise
+                await self.session_store.delete(session_id)
+                self._evicted.pop(session_id, None)
+                self.metrics.sessions_restored.inc()
+        finally:
+            if self._restore_locks.get(session_id) is lock:
+                del self._restore_locks[session_id]
+
+    async def _evict_session(self, session: BrowserSession, reason: str) -> None:
+        if self._sessions.get(session.session_id) is not session or session.lock.locked():
+            return
+        # Holding the lock makes runs that arrive mid-spill wait, then restore from disk.
+        async with session.lock:
+            if await self._spill_session(session):
+                self._sessions.pop(session.session_id, None)
+                self.metrics.sessions_spilled.inc(reason=reason)
+                await self._release_session(session.session_id)
+            else:
+                await self._forget_session(session, reason)
+            await self._close_browser_session(session)
+
+    def _has_room_for_session(self) -> bool:
+        return (
+            self.max_sessions <= 0
+            or len(self._sessions) + self._reserved_sessions < self.max_sessions
+        )
+
+    async def _make_room_for_session(self) -> None:
+        # Reserves a slot for a session being created, so concurrent creations cannot
+        # all pass the check before any of them is inserted.
+        async with self._room_lock:
+            if not self._has_room_for_session():
+                for session in self._idle_sessions_lru():
+                    await self._evict_session(session, "session_limit")
+                    if self._has_room_for_session():
+                        break
+                else:
+                    raise GeminiComputerUseError(
+                        status_code=503,
+                        error=self._normalize_error(
+                            status_code=503,
+                            message="All browser sessions are busy; retry shortly.",
+                            error_type="capacity_exceeded",
+                        ),
+                    )
+            self._reserved_sessions += 1
+
+    async def _reap_sessions(self) -> None:
+        if self.session_store is not None and self.session_spill_ttl_s > 0:
+            await self.session_store.prune(self.session_spill_ttl_s)
+        if self.session_idle_ttl_s > 0:
+            cutoff_ms = self._now_ms() - int(self.session_idle_ttl_s * 1000)
+            for session in self._idle_sessions_lru():
+                if session.updated_at_ms > cutoff_ms:
+                    break
+                await self._evict_session(session, "idle_timeout")
+
+        if self.rss_budget_bytes <= 0:
+            return
+        for session in self._idle_sessions_lru():
+            rss_bytes = await asyncio.to_thread(process_tree_rss_bytes)
+            if rss_bytes is None or rss_bytes <= self.rss_budget_bytes:
+                return
+            await self._evict_session(session, "memory_budget")
+
+    async def _claim_session(self, session_id: str) -> bool:
+        if self.session_registry is None:
+            return True
+        return await self.session_registry.claim(
+            session_id, self.worker_id, stale_after_s=self.owner_stale_after_s
+        )
+
+    async def _release_session(self, session_id: str) -> None:
+        if self.session_registry is not None:
+            await self.session_registry.release(session_id, self.worker_id)
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.worker_heartbeat_s)
+            try:
+                await self.session_registry.heartbeat(self.worker_id, self.worker_url)
+                await self.session_registry.prune(_REGISTRY_PRUNE_AFTER_S)
+            except Exception:
+                pass
+
+    async def session_owner(self, session_id: str) -> SessionOwner | None:
+        if self.session_registry is None or session_id in self._sessions:
+            return None
+        owner = await self.session_registry.owner(
+            session_id, stale_after_s=self.owner_stale_after_s
+        )
+        if owner is None or owner.worker_id == self.worker_id:
+            return None
+        return owner
+
+    def owner_url(self, owner: SessionOwner, path: str, query: str) -> str:
+        self.metrics.requests_forwarded.inc(result="redirected")
+        url = f"{owner.url.rstrip('/')}{path}"
+        return f"{url}?{query}" if query else url
+
+    async def forward(
+        self,
+        owner: SessionOwner,
+        *,
+        method: str,
+        path: str,
+        query: str,
+        headers: dict[str, str],
+        body: bytes,
+    ) -> httpx.Response:
+        try:
+            response = await self.forwarder.open(
+                owner.url,
+                method=method,
+                path=path,
+                query=query,
+                headers=headers,
+                body=body,
+            )
+        except httpx.HTTPError as exc:
+            self.metrics.requests_forwarded.inc(result="error")
+            raise GeminiComputerUseError(
+                status_code=502,
+                error=self._normalize_error(
+                    status_code=502,
+                    message=f"Worker {owner.worker_id} holding this session is unreachable: {exc}",
+                    error_type="session_owner_unreachable",
+                ),
+            ) from exc
+        self.metrics.requests_forwarded.inc(result="forwarded")
+        return response
+
+    async def _reap_sessions_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.reap_interval_s)
+            try:
+                await self._reap_sessions()
+            except Exception:
+                pass
+
+    @classmethod
+    def _queue_full_error(cls) -> GeminiComputerUseError:
+        return GeminiComputerUseError(
+            status_code=429,
+            error=cls._normalize_error(
+                status_code=429,
+                message="Too many instructions are queued; retry shortly.",
+                error_type="queue_full",
+            ),
+        )
+
+    def check_admission(self) -> None:
+        if self._run_limiter.full():
+            self.metrics.runs_rejected.inc()
+            raise self._queue_full_error()
+
+    def _admit_run(self, session_id: str | None) -> Ticket:
+        # Each new-session request is its own queue; follow-ups share their session's.
+        try:
+            return self._run_limiter.enqueue(session_id or object())
+        except QueueFull:
+            self.metrics.runs_rejected.inc()
+            raise self._queue_full_error() from None
+
+    def get_session(self, session_id: str) -> BrowserSession:
+        session = self._sessions.get(session_id)
+        if session is None and session_id in self._evicted:
+            raise self._evicted_error(session_id)
+        if session is None:
+            raise GeminiComputerUseError(
+                status_code=404,
+                error=self._normalize_error(
+                    status_code=404,
+                    message=f"Unknown session_id: {session_id}",
+                    error_type="session_not_found",
+                ),
+            )
+        return session
+
+    def get_frame(self, session_id: str, seq: int) -> Frame:
+        frame = self.get_session(session_id).frames.get(seq)
+        if frame is None:
+            raise GeminiComputerUseError(
+                status_code=404,
+                error=self._normalize_error(
+                    status_code=404,
+                    message=f"Frame {seq} is no longer held for session {session_id}.",
+                    error_type="frame_not_found",
+                ),
+            )
+        return frame
+
+    async def _resolve_session(self, session_id: str) -> BrowserSession:
+        if session_id not in self._sessions and self._spilled(session_id):
+            await self._restore_session(session_id)
+        return self.get_session(session_id)
+
     async def get_or_create_session(self, session_id: str | None) -> BrowserSession:
         if session_id:
-            session = self._sessions.get(session_id)
-            if session is None:
-                raise GeminiComputerUseError(
-                    status_code=404,
-                    error=self._normalize_error(
-                        status_code=404,
-                        message=f"Unknown session_id: {session_id}",
-                        error_type="session_not_found",
-                    ),
-                )
+            session = await self._resolve_session(session_id)
+            # Refresh recency so the reaper does not race the upcoming run.
+            session.updated_at_ms = self._now_ms()
             return session
         return await self._create_session()
 
+    @asynccontextmanager
+    async def _hold_session(self, session_id: str | None) -> AsyncIterator[BrowserSession]:
+        while True:
+            session = await self.get_or_create_session(session_id)
+            self._queued_runs += 1
+            try:
+                await session.lock.acquire()
+            finally:
+                self._queued_runs -= 1
+            if not session.closed:
+                break
+            session.lock.release()
+            # Spilled while this run waited; the next lookup restores it from disk.
+            if not (session_id and self._spilled(session_id)):
+                raise self._evicted_error(session.session_id)
+        try:
+            yield session
+        finally:
+            session.lock.release()
+
+    async def subscribe_screencast(self, session_id: str) -> asyncio.Queue[bytes]:
+        session = await self._resolve_session(session_id)
+        if session.screencast is None:
+            session.screencast = Screencast(
+                max_fps=self.screencast_max_fps,
+                quality=self.screencast_quality,
+                max_width=self.viewport_width,
+                max_height=self.viewport_height,
+            )
+        await session.screencast.bind(session.page)
+        return await session.screencast.subscribe()
+
+    async def unsubscribe_screencast(self, session_id: str, queue: asyncio.Queue[bytes]) -> None:
+        session = self._sessions.get(session_id)
+        if session is not None and session.screencast is not None:
+            await session.screencast.unsubscribe(queue)
+
+    @staticmethod
+    def _cancel_run(session: BrowserSession, reason: str) -> bool:
+        task = session.run_task
+        if task is None or task.done():
+            return False
+        session.stop_reason = reason
+        task.cancel()
+        return True
+
+    def stop_run(self, session_id: str) -> bool:
+        return self._cancel_run(self.get_session(session_id), "stop")
+
     async def close_session(self, session_id: str) -> bool:
+        spilled = self._spilled(session_id)
+        if spilled:
+            await self.session_store.delete(session_id)
         session = self._sessions.pop(session_id, None)
+        await self._release_session(session_id)
         if session is None:
-            return False
-        await session.context.close()
+            return spilled
+        # Stop the active run and let it release the lock before the context goes away;
+        # runs queued on the lock see the session closed and give up.
+        session.closed = True
+        self._cancel_run(session, "deleted")
+        async with session.lock:
+            pass
+        await self._drop_context_cache(session)
+        await self._close_browser_session(session)
         return True
 
     async def close_all(self) -> None:
+        if self._reaper_task is not None:
+            self._reaper_task.cancel()
+            self._reaper_task = None
+        if self._loop_lag_task is not None:
+            self._loop_lag_task.cancel()
+            self._loop_lag_task = None
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            self._heartbeat_task = None
+
         sessions = list(self._sessions.values())
         self._sessions.clear()
         for session in sessions:
-            await session.context.close()
+            # As in close_session, let the cancelled run finish its cleanup before the
+            # snapshot is taken; runs queued on the lock see the session closed.
+            session.closed = True
+            self._cancel_run(session, "shutdown")
+            async with session.lock:
+                pass
+            # Spilled sessions survive a restart and are restored on their next request.
+            await self._spill_session(session)
+            await self._close_browser_session(session)
+        if self.session_registry is not None:
+            # Hand off: with a shared spill directory, any worker restores these next.
+            await self.session_registry.remove_worker(self.worker_id)
+            await self.session_registry.close()
+        await self.forwarder.close()
+        await self._context_pool.close()
+        await self._browser_pool.close()
 
         async with self._state_lock:
-            if self._browser is not None:
-                await self._browser.close()
-                self._browser = None
             if self._playwright is not None:
                 await self._playwright.stop()
                 self._playwright = None
-
-    @staticmethod
-    def _to_int(value: Any, *, key: str) -> int:
-        if isinstance(value, bool) or not isinstance(value, (int, float)):
-            raise ValueError(f"Missing or invalid numeric argument: {key}")
-        return int(value)
-
-    def _denorm_x(self, x: int) -> int:
-        x_px = int(x / 1000 * self.viewport_width)
-        return max(0, min(self.viewport_width - 1, x_px))
-
-    def _denorm_y(self, y: int) -> int:
-        y_px = int(y / 1000 * self.viewport_height)
-        return max(0, min(self.viewport_height - 1, y_px))
+        self.workers.shutdown()
 
     @staticmethod
     def _safe_args(raw: dict[str, Any]) -> dict[str, Any]:
@@ -166,117 +954,132 @@ class GeminiComputerUseService:
         safe.pop("safety_decision", None)
         return safe
 
-    async def _capture_state(self, session: BrowserSession) -> dict[str, Any]:
-        screenshot_bytes = await session.page.screenshot(type="png")
-        screenshot_base64 = base64.b64encode(screenshot_bytes).decode("ascii")
-        session.last_screenshot_base64 = screenshot_base64
+    async def _capture_frame(self, session: BrowserSession, spec: FrameSpec) -> Frame:
+        scale = spec.scale(self.viewport_width, self.viewport_height)
+        if spec.format == "webp" or scale is not None:
+            # Playwright only encodes PNG/JPEG at full size; Chromium can encode WebP
+            # and rasterize a downscaled viewport over CDP.
+            if session.cdp is None:
+                session.cdp = await session.context.new_cdp_session(session.page)
+            params: dict[str, Any] = {"format": spec.format}
+            if spec.quality is not None:
+                params["quality"] = spec.quality
+            if scale is not None:
+                # Clip coordinates are document-relative, so offset by the scroll position.
+                metrics = await session.cdp.send("Page.getLayoutMetrics")
+                viewport = metrics["cssVisualViewport"]
+                params["clip"] = {
+                    "x": viewport["pageX"],
+                    "y": viewport["pageY"],
+                    "width": self.viewport_width,
+                    "height": self.viewport_height,
+                    "scale": scale,
+                }
+            result = await session.cdp.send("Page.captureScreenshot", params)
+            frame = Frame.from_base64(result["data"], mime_type=spec.mime_type)
+        else:
+            options: dict[str, Any] = {"type": spec.format}
+            if spec.quality is not None:
+                options["quality"] = spec.quality
+            screenshot_bytes = await session.page.screenshot(**options)
+            frame = Frame.from_bytes(screenshot_bytes, mime_type=spec.mime_type)
+        if spec.grayscale:
+            frame = await self.workers.run(spec.to_grayscale, frame)
+        return frame
+
+    async def _capture_state(
+        self,
+        session: BrowserSession,
+        *,
+        full_frame: bool = False,
+        include_ui: bool = True,
+        timings: PhaseTimings | None = None,
+    ) -> dict[str, Any]:
+        started_at = time.perf_counter()
+        model_frame = await self._capture_frame(session, self.model_frame_spec)
+        ui_frame = model_frame
+        # Live-view clients get pixels from the screencast; skip the UI capture.
+        if include_ui and self.ui_frame_spec != self.model_frame_spec:
+            ui_frame = await self._capture_frame(session, self.ui_frame_spec)
+        capture_s = time.perf_counter() - started_at
+        self.metrics.capture_seconds.observe(capture_s)
+        if timings is not None:
+            timings.add("capture", capture_s)
+
+        # Unchanged captures keep the previous Frame so its encodings are reused.
+        distance = self.frame_perceptual_distance
+        # Matching decodes and hashes the capture; keep that work off the event loop.
+        session.model_frame_unchanged = await self.workers.run(
+            partial(model_frame.matches, session.model_frame, perceptual_distance=distance)
+        )
+        if session.model_frame_unchanged:
+            model_frame = session.model_frame
+            self.metrics.frames_unchanged.inc(target="model")
+        else:
+            self.metrics.capture_bytes.observe(model_frame.size, target="model")
+
+        session.model_frame = model_frame
         session.last_url = session.page.url
         session.updated_at_ms = self._now_ms()
-        return {
+        state: dict[str, Any] = {
             "url": session.last_url,
-            "screenshot_base64": screenshot_base64,
             "updated_at_ms": session.updated_at_ms,
         }
+        if not include_ui:
+            # session.ui_frame stays the last frame the client was sent.
+            return state
 
-    async def _settle_after_action(self, page: Page) -> None:
-        try:
-            await page.wait_for_load_state(timeout=5000)
-        except Exception:
-            pass
-        await asyncio.sleep(self.action_settle_ms / 1000.0)
+        ui_unchanged = await self.workers.run(
+            partial(ui_frame.matches, session.ui_frame, perceptual_distance=distance)
+        )
+        if ui_unchanged:
+            ui_frame = session.ui_frame
+            self.metrics.frames_unchanged.inc(target="ui")
+        elif ui_frame is not model_frame:
+            self.metrics.capture_bytes.observe(ui_frame.size, target="ui")
+        session.ui_frame = ui_frame
+        if ui_unchanged and not full_frame:
+            if self.frame_delivery != "reference":
+                saved = len(ui_frame.base64)
+                session.ui_bytes_saved += saved
+                self.metrics.frame_bytes_saved.inc(saved, target="ui")
+            state["screenshot_unchanged"] = True
+        elif self.frame_delivery == "reference":
+            seq = session.frames.add(ui_frame)
+            state["screenshot_id"] = seq
+            state["screenshot_url"] = f"/api/gemini/{session.session_id}/frames/{seq}"
+            state["screenshot_mime_type"] = ui_frame.mime_type
+            state["screenshot_unchanged"] = False
+        else:
+            started_at = time.perf_counter()
+            state["screenshot_base64"] = await self.workers.run(lambda: ui_frame.base64)
+            if timings is not None:
+                timings.since("encode", started_at)
+            state["screenshot_mime_type"] = ui_frame.mime_type
+            state["screenshot_unchanged"] = False
+        return state
 
-    async def _execute_action(self, *, page: Page, name: str, args: dict[str, Any]) -> dict[str, Any]:
+    async def _execute_action(
+        self,
+        *,
+        session: BrowserSession,
+        name: str,
+        args: dict[str, Any],
+    ) -> dict[str, Any]:
+        page = session.page
         if "safety_decision" in args and not self.auto_approve_risky_actions:
             return {
                 "status": "blocked",
                 "message": "Action blocked because safety confirmation is required.",
             }
 
+        spec = self.actions.get(name)
+        if spec is None:
+            return {"status": "error", "message": f"Unsupported action: {name}"}
         try:
-            if name == "open_web_browser":
-                pass
-            elif name == "wait_5_seconds":
-                await asyncio.sleep(5)
-            elif name == "go_back":
-                await page.go_back()
-            elif name == "go_forward":
-                await page.go_forward()
-            elif name == "search":
-                await page.goto("https://www.google.com")
-                query = args.get("query")
-                if isinstance(query, str) and query.strip():
-                    await page.keyboard.type(query.strip())
-                    await page.keyboard.press("Enter")
-            elif name == "navigate":
-                url = args.get("url")
-                if not isinstance(url, str) or not url.strip():
-                    raise ValueError("Missing navigate.url")
-                await page.goto(url.strip())
-            elif name == "click_at":
-                x = self._denorm_x(self._to_int(args.get("x"), key="x"))
-                y = self._denorm_y(self._to_int(args.get("y"), key="y"))
-                await page.mouse.click(x, y)
-            elif name == "hover_at":
-                x = self._denorm_x(self._to_int(args.get("x"), key="x"))
-                y = self._denorm_y(self._to_int(args.get("y"), key="y"))
-                await page.mouse.move(x, y)
-            elif name == "type_text_at":
-                x = self._denorm_x(self._to_int(args.get("x"), key="x"))
-                y = self._denorm_y(self._to_int(args.get("y"), key="y"))
-                text = args.get("text")
-                if not isinstance(text, str):
-                    raise ValueError("Missing type_text_at.text")
-                await page.mouse.click(x, y)
-                if bool(args.get("clear_before_typing", True)):
-                    select_all = "Meta+A" if sys.platform == "darwin" else "Control+A"
-                    await page.keyboard.press(select_all)
-                    await page.keyboard.press("Backspace")
-                await page.keyboard.type(text)
-                if bool(args.get("press_enter", True)):
-                    await page.keyboard.press("Enter")
-            elif name == "key_combination":
-                keys = args.get("keys")
-                if not isinstance(keys, str) or not keys.strip():
-                    raise ValueError("Missing key_combination.keys")
-                await page.keyboard.press(keys.strip())
-            elif name == "scroll_document":
-                direction = str(args.get("direction", "down")).strip().lower()
-                if direction == "down":
-                    await page.keyboard.press("PageDown")
-                elif direction == "up":
-                    await page.keyboard.press("PageUp")
-                elif direction == "left":
-                    await page.evaluate("window.scrollBy(-400, 0)")
-                elif direction == "right":
-                    await page.evaluate("window.scrollBy(400, 0)")
-                else:
-                    raise ValueError("Unsupported scroll direction")
-            elif name == "scroll_at":
-                x = self._denorm_x(self._to_int(args.get("x"), key="x"))
-                y = self._denorm_y(self._to_int(args.get("y"), key="y"))
-                magnitude = self._to_int(args.get("magnitude", 800), key="magnitude")
-                direction = str(args.get("direction", "down")).strip().lower()
-                dy = magnitude if direction == "down" else -magnitude
-                await page.mouse.move(x, y)
-                await page.mouse.wheel(0, dy)
-            elif name == "drag_and_drop":
-                sx = self._denorm_x(self._to_int(args.get("x"), key="x"))
-                sy = self._denorm_y(self._to_int(args.get("y"), key="y"))
-                dx = self._denorm_x(
-                    self._to_int(args.get("destination_x"), key="destination_x")
-                )
-                dy = self._denorm_y(
-                    self._to_int(args.get("destination_y"), key="destination_y")
-                )
-                await page.mouse.move(sx, sy)
-                await page.mouse.down()
-                await page.mouse.move(dx, dy, steps=10)
-                await page.mouse.up()
-            else:
-                return {"status": "error", "message": f"Unsupported action: {name}"}
-
-            await self._settle_after_action(page)
-            return {"status": "ok", "message": "Action completed."}
+            await self.actions.run(page, spec, args)
+            settle = await self.settle.settle(page, session.network, spec.settle)
+            return {"status": "ok", "message": "Action completed.", **settle}
         except Exception as exc:
             return {"status": "error", "message": str(exc)}
 
@@ -292,17 +1095,161 @@ class GeminiComputerUseService:
             thinking_config=types.ThinkingConfig(include_thoughts=True),
         )
 
-    def _generate_content(
+    async def _drop_context_cache(self, session: BrowserSession) -> None:
+        name, session.context_cache = session.context_cache, None
+        if name is None:
+            return
+        try:
+            await self._get_client().aio.caches.delete(name=name)
+        except Exception:
+            # The cache expires on its own TTL.
+            pass
+
+    async def _cached_config(
+        self,
+        session: BrowserSession,
+        history: ConversationHistory,
+    ) -> tuple[types.GenerateContentConfig, int]:
+        config = self._config()
+        await self._drop_context_cache(session)
+        prefix = history.contents[: history.prefix_length]
+        if not self.context_cache_enabled or not prefix:
+            return config, 0
+        # Earlier instructions do not change during this one, so they are cached once
+        # and every turn sends only the new contents.
+        try:
+            cache = await self._get_client().aio.caches.create(
+                model=self.model,
+                config=types.CreateCachedContentConfig(
+                    contents=prefix,
+                    tools=config.tools,
+                    ttl=f"{self.context_cache_ttl_s}s",
+                ),
+            )
+        except Exception:
+            # Providers refuse caches below a minimum size; send the full history instead.
+            self.metrics.context_cache.inc(result="failed")
+            return config, 0
+        self.metrics.context_cache.inc(result="created")
+        session.context_cache = cache.name
+        return (
+            types.GenerateContentConfig(
+                cached_content=cache.name,
+                thinking_config=config.thinking_config,
+            ),
+            len(prefix),
+        )
+
+    def _provider_retry_delay_s(self, exc: Exception, attempt: int) -> float | None:
+        code = getattr(exc, "code", None)
+        if code not in {429, 503} or attempt >= self.provider_max_retries:
+            return None
+        self.metrics.provider_retries.inc(code=str(code))
+        return backoff_delay_s(attempt, base_s=self.provider_retry_base_s, cap_s=self.provider_retry_cap_s)
+
+    def _rate_limited_error(self, exc: Exception) -> GeminiComputerUseError:
+        return GeminiComputerUseError(
+            status_code=429,
+            error=self._normalize_error(
+                status_code=429,
+                message=f"Gemini rate limit exceeded after {self.provider_max_retries} retries: {exc}",
+                error_type="rate_limited",
+            ),
+        )
+
+    async def _generate_content(
         self,
         *,
         contents: list[types.Content],
         config: types.GenerateContentConfig,
-    ) -> Any:
+        key: str,
+    ) -> AsyncIterator[Any]:
         client = self._get_client()
-        return client.models.generate_content(
-            model=self.model,
-            contents=contents,
-            config=config,
+        attempt = 0
+        while True:
+            received_chunk = False
+            try:
+                if not self.stream_model_output:
+                    async with self._model_limiter.slot(key):
+                        response = await client.aio.models.generate_content(
+                            model=self.model,
+                            contents=contents,
+                            config=config,
+                        )
+                    yield response
+                    return
+
+                async with self._model_limiter.slot(key):
+                    stream = await client.aio.models.generate_content_stream(
+                        model=self.model,
+                        contents=contents,
+                        config=config,
+                    )
+                while True:
+                    # The slot covers waiting on the provider only; actions run between
+                    # chunks while the consumer holds this generator suspended.
+                    async with self._model_limiter.slot(key):
+                        try:
+                            chunk = await stream.__anext__()
+                        except StopAsyncIteration:
+                            break
+                    received_chunk = True
+                    yield chunk
+                return
+            except Exception as exc:
+                # Once chunks were handed out their actions have run; a retry would repeat them.
+                delay_s = None if received_chunk else self._provider_retry_delay_s(exc, attempt)
+                if delay_s is None:
+                    if getattr(exc, "code", None) == 429:
+                        raise self._rate_limited_error(exc) from exc
+                    raise
+                attempt += 1
+                await asyncio.sleep(delay_s)
+
+    async def _timed_chunks(
+        self,
+        chunks: AsyncIterator[Any],
+        timings: PhaseTimings,
+    ) -> AsyncIterator[Any]:
+        # Only time spent waiting on the provider counts; actions run between chunks.
+        started_at = time.perf_counter()
+        waiting_since = started_at
+        first_chunk = True
+        try:
+            async with aclosing(chunks):
+                async for chunk in chunks:
+                    now = time.perf_counter()
+                    timings.add("model", now - waiting_since)
+                    if first_chunk:
+                        self.metrics.model_first_chunk_seconds.observe(now - started_at)
+                        first_chunk = False
+                    yield chunk
+                    waiting_since = time.perf_counter()
+        except Exception:
+            self.metrics.model_errors.inc()
+            raise
+
+    @staticmethod
+    async def _replayed_chunks(step: TrajectoryStep) -> AsyncIterator[Any]:
+        yield types.GenerateContentResponse(
+            candidates=[types.Candidate(content=step.model_content())]
+        )
+
+    async def _start_trajectory(
+        self,
+        message: str,
+    ) -> tuple[TrajectoryRecorder | None, TrajectoryReplay | None]:
+        if self.trajectory_mode == "off":
+            return None, None
+        recorder = TrajectoryRecorder(instruction=message, model=self.model)
+        if self.trajectory_mode != "replay":
+            return recorder, None
+        trajectory = await self.trajectories.load(message)
+        # Recordings from another model may not mean the same thing to this one.
+        if trajectory is None or trajectory.model != self.model or not trajectory.steps:
+            return recorder, None
+        return recorder, TrajectoryReplay(
+            trajectory, perceptual_distance=self.trajectory_frame_distance
         )
 
     @staticmethod
@@ -315,43 +1262,54 @@ class GeminiComputerUseService:
             return parts
         return []
 
-    @classmethod
-    def _candidate_text(cls, candidate: Any) -> str:
-        text_parts: list[str] = []
-        for part in cls._candidate_parts(candidate):
-            text = getattr(part, "text", None)
-            if isinstance(text, str) and text:
-                text_parts.append(text)
-        return " ".join(text_parts).strip()
-
-    @classmethod
-    def _candidate_function_calls(cls, candidate: Any) -> list[Any]:
-        calls: list[Any] = []
-        for part in cls._candidate_parts(candidate):
-            function_call = getattr(part, "function_call", None)
-            if function_call is not None and getattr(function_call, "name", None):
-                calls.append(function_call)
-        return calls
-
     @staticmethod
+    def _merge_streamed_part(parts: list[Any], part: Any) -> None:
+        # Streamed text arrives in fragments; fold them back into one part per
+        # run so the history sent on later turns stays compact.
+        text = getattr(part, "text", None)
+        previous = parts[-1] if parts else None
+        if (
+            isinstance(text, str)
+            and previous is not None
+            and isinstance(getattr(previous, "text", None), str)
+            and bool(getattr(previous, "thought", False)) == bool(getattr(part, "thought", False))
+            and getattr(previous, "thought_signature", None) is None
+        ):
+            parts[-1] = types.Part(
+                text=previous.text + text,
+                thought=getattr(part, "thought", None),
+                thought_signature=getattr(part, "thought_signature", None),
+            )
+            return
+        parts.append(part)
+
     def _build_function_response(
+        self,
         *,
+        session: BrowserSession,
         name: str,
         payload: dict[str, Any],
     ) -> types.FunctionResponse:
-        response_data = {k: v for k, v in payload.items() if k != "screenshot_base64"}
-        screenshot_base64 = payload.get("screenshot_base64")
+        response_data = {
+            k: v for k, v in payload.items() if k not in _UI_ONLY_PAYLOAD_KEYS
+        }
+        frame = session.model_frame
+        if frame is not None and session.model_frame_unchanged and self.omit_duplicate_model_frames:
+            # The model already holds this image from the previous response.
+            response_data["screenshot"] = "unchanged since the previous screenshot"
+            session.model_bytes_saved += frame.size
+            self.metrics.frame_bytes_saved.inc(frame.size, target="model")
+            frame = None
 
-        if isinstance(screenshot_base64, str) and screenshot_base64:
-            screenshot_bytes = base64.b64decode(screenshot_base64)
+        if frame is not None:
             return types.FunctionResponse(
                 name=name,
                 response=response_data,
                 parts=[
                     types.FunctionResponsePart(
                         inline_data=types.FunctionResponseBlob(
-                            mime_type="image/png",
-                            data=screenshot_bytes,
+                            mime_type=frame.mime_type,
+                            data=frame.data,
                         )
                     )
                 ],
@@ -359,47 +1317,295 @@ class GeminiComputerUseService:
 
         return types.FunctionResponse(name=name, response=response_data)
 
+    def _record_action(
+        self,
+        timings: PhaseTimings,
+        *,
+        name: str,
+        result: dict[str, Any],
+        elapsed_s: float,
+    ) -> None:
+        settle_s = result.get("settle_ms", 0) / 1000.0
+        strategy = result.get("settle_strategy")
+        # Model-chosen names are unbounded; keep label cardinality fixed.
+        action = name if self.actions.get(name) is not None else "unsupported"
+        timings.add("action", elapsed_s - settle_s)
+        timings.add("settle", settle_s)
+        self.metrics.actions.inc(action=action, status=str(result.get("status")))
+        self.metrics.action_seconds.observe(max(0.0, elapsed_s - settle_s), action=action)
+        if strategy is not None:
+            self.metrics.settle_seconds.observe(settle_s, strategy=strategy)
+
+    @staticmethod
+    def _timing_event(session: BrowserSession, turn: int, timings: PhaseTimings) -> "RunEvent":
+        return RunEvent(
+            "timing",
+            {
+                "session_id": session.session_id,
+                "turn": turn + 1,
+                "phases_ms": timings.as_ms(),
+            },
+        )
+
     async def stream_instruction(
         self,
         *,
         message: str,
         session_id: str | None = None,
         max_turns: int | None = None,
+        include_screenshots: bool = True,
     ) -> AsyncIterator[str]:
+        # The run gets its own task so a stop request can cancel it without tearing
+        # down the response, and so its cleanup is not cut short when the client
+        # disconnects and the server cancels this generator.
+        events: asyncio.Queue[RunEvent | None] = asyncio.Queue()
+        # Bounds how far the run gets ahead of a slow client; the closing None skips it.
+        buffered = asyncio.Semaphore(_RUN_EVENT_BUFFER)
+
+        async def produce() -> None:
+            run = self._run_instruction(
+                message=message,
+                session_id=session_id,
+                max_turns=max_turns,
+                include_screenshots=include_screenshots,
+            )
+            try:
+                async with aclosing(self._paced(run, buffered)) as paced:
+                    async for run_event in paced:
+                        events.put_nowait(run_event)
+            finally:
+                events.put_nowait(None)
+
+        task = asyncio.create_task(produce())
+        try:
+            while (run_event := await events.get()) is not None:
+                buffered.release()
+                yield await self._emit(run_event.event, run_event.data, run_event.timings)
+            await task
+        finally:
+            if not task.done():
+                self.metrics.runs_cancelled.inc(reason="disconnect")
+                task.cancel()
+
+    @staticmethod
+    async def _paced(
+        run: AsyncIterator["RunEvent"], buffered: asyncio.Semaphore
+    ) -> AsyncIterator["RunEvent"]:
+        # Takes a buffer slot after each event; the consumer releases it once the event
+        # is sent. The closing events skip it, so a stopped run releases its session and
+        # admission slot even if the client has stopped reading.
+        cancelled: asyncio.CancelledError | None = None
+        try:
+            while True:
+                try:
+                    run_event = await (
+                        run.athrow(cancelled) if cancelled is not None else run.__anext__()
+                    )
+                except StopAsyncIteration:
+                    return
+                cancelled = None
+                yield run_event
+                if run_event.event in _FINAL_RUN_EVENTS:
+                    continue
+                try:
+                    await buffered.acquire()
+                except asyncio.CancelledError as exc:
+                    # A stop that lands while waiting on the client is raised inside the
+                    # run, which ends it with a stopped done event.
+                    cancelled = exc
+        finally:
+            await run.aclose()
+
+    async def _run_instruction(
+        self,
+        *,
+        message: str,
+        session_id: str | None = None,
+        max_turns: int | None = None,
+        include_screenshots: bool = True,
+        start_url: str | None = None,
+    ) -> AsyncIterator["RunEvent"]:
         session: BrowserSession | None = None
         turn_limit = max(1, min(30, max_turns if isinstance(max_turns, int) else self.max_turns))
 
+        ticket: Ticket | None = None
         try:
-            session = await self.get_or_create_session(session_id)
-            async with session.lock:
-                state = await self._capture_state(session)
-                yield self._sse_event(
+            ticket = self._admit_run(session_id)
+            if not ticket.granted:
+                queued_at = time.perf_counter()
+                async for position in self._run_limiter.positions(ticket):
+                    yield RunEvent("queued", {"session_id": session_id, "position": position})
+                self.metrics.admission_wait_seconds.observe(time.perf_counter() - queued_at)
+            async with self._hold_session(session_id) as held:
+                session = held
+                session.run_task = asyncio.current_task()
+                session.stop_reason = None
+                recovered = await self._recover_session(session)
+                if start_url:
+                    await session.page.goto(start_url)
+                state = await self._capture_state(session, full_frame=True)
+                yield RunEvent(
                     "session",
-                    {"session_id": session.session_id, **state},
+                    {
+                        "session_id": session.session_id,
+                        "recovered": recovered,
+                        "restored": session.restored,
+                        **state,
+                    },
                 )
+                session.restored = False
 
-                initial_png = base64.b64decode(state["screenshot_base64"])
-                contents: list[types.Content] = [
+                initial_frame = session.model_frame
+                history = session.history or ConversationHistory(
+                    max_screenshots=self.history_max_screenshots
+                )
+                if self.session_history_instructions > 0:
+                    session.history = history
+                history.start_instruction(
                     types.Content(
                         role="user",
                         parts=[
                             types.Part(text=message.strip()),
-                            types.Part.from_bytes(data=initial_png, mime_type="image/png"),
+                            types.Part.from_bytes(
+                                data=initial_frame.data,
+                                mime_type=initial_frame.mime_type,
+                            ),
                         ],
-                    )
-                ]
-                config = self._config()
+                    ),
+                    max_instructions=self.session_history_instructions,
+                )
+                config, cached_contents = await self._cached_config(session, history)
                 last_text = ""
+                replayed_turns = 0
+                recorder, replay = await self._start_trajectory(message.strip())
+                if replay is not None:
+                    yield RunEvent(
+                        "replay",
+                        {
+                            "session_id": session.session_id,
+                            "status": "started",
+                            "steps": len(replay.steps),
+                        },
+                    )
 
                 for turn in range(turn_limit):
-                    response = await asyncio.to_thread(
-                        self._generate_content,
-                        contents=contents,
-                        config=config,
+                    timings = PhaseTimings()
+                    yield RunEvent(
+                        "history",
+                        {
+                            "session_id": session.session_id,
+                            "turn": turn + 1,
+                            "cached_contents": cached_contents,
+                            **history.stats(),
+                        },
+                        timings,
                     )
+                    model_parts: list[Any] = []
+                    function_responses: list[types.FunctionResponse] = []
+                    action_statuses: list[str] = []
+                    received_candidate = False
+                    observed_url = session.last_url
+                    observed_frame = session.model_frame
+
+                    replay_step = None
+                    if replay is not None and replay.active:
+                        # Matching may compute a perceptual hash; keep it off the event loop.
+                        replay_step = await self.workers.run(
+                            partial(replay.next_step, url=observed_url, frame=observed_frame)
+                        )
+                        if replay_step is None:
+                            self.metrics.replay_turns.inc(outcome="diverged")
+                            yield RunEvent(
+                                "replay",
+                                {
+                                    "session_id": session.session_id,
+                                    "status": "diverged",
+                                    "turn": turn + 1,
+                                    "reason": replay.divergence,
+                                },
+                            )
+                    if replay_step is not None:
+                        replayed_turns += 1
+                        self.metrics.replay_turns.inc(outcome="replayed")
+                        chunks = self._replayed_chunks(replay_step)
+                    else:
+                        chunks = self._timed_chunks(
+                            self._generate_content(
+                                contents=history.contents[cached_contents:],
+                                config=config,
+                                key=session.session_id,
+                            ),
+                            timings,
+                        )
+
+                    # Closing the stream promptly frees its model-call slot if the run is cancelled.
+                    async with aclosing(chunks):
+                        async for chunk in chunks:
+                            candidates = getattr(chunk, "candidates", None)
+                            if not isinstance(candidates, list) or not candidates:
+                                continue
+                            received_candidate = True
+
+                            for part in self._candidate_parts(candidates[0]):
+                                self._merge_streamed_part(model_parts, part)
+
+                                text = getattr(part, "text", None)
+                                if isinstance(text, str) and text:
+                                    yield RunEvent(
+                                        "assistant",
+                                        {
+                                            "session_id": session.session_id,
+                                            "text": text,
+                                            "thought": bool(getattr(part, "thought", False)),
+                                            "turn": turn + 1,
+                                            "replayed": replay_step is not None,
+                                        },
+                                        timings,
+                                    )
 
-                    candidates = getattr(response, "candidates", None)
-                    if not isinstance(candidates, list) or not candidates:
+                                function_call = getattr(part, "function_call", None)
+                                if function_call is None or not getattr(function_call, "name", None):
+                                    continue
+
+                                # Function call parts arrive whole, so run them without
+                                # waiting for the rest of the stream.
+                                name = str(function_call.name)
+                                raw_args = dict(getattr(function_call, "args", {}) or {})
+                                action_started_at = time.perf_counter()
+                                action_result = await self._execute_action(
+                                    session=session,
+                                    name=name,
+                                    args=raw_args,
+                                )
+                                self._record_action(
+                                    timings,
+                                    name=name,
+                                    result=action_result,
+                                    elapsed_s=time.perf_counter() - action_started_at,
+                                )
+                                action_state = await self._capture_state(
+                                    session, include_ui=include_screenshots, timings=timings
+                                )
+                                action_statuses.append(str(action_result.get("status")))
+                                action_payload = {
+                                    "session_id": session.session_id,
+                                    "action": name,
+                                    "args": self._safe_args(raw_args),
+                                    "replayed": replay_step is not None,
+                                    **action_result,
+                                    **action_state,
+                                }
+
+                                yield RunEvent("action", action_payload, timings)
+                                function_responses.append(
+                                    self._build_function_response(
+                                        session=session,
+                                        name=name,
+                                        payload=action_payload,
+                                    )
+                                )
+
+                    if not received_candidate:
                         raise GeminiComputerUseError(
                             status_code=502,
                             error=self._normalize_error(
@@ -409,61 +1615,63 @@ class GeminiComputerUseService:
                             ),
                         )
 
-                    candidate = candidates[0]
-                    candidate_content = getattr(candidate, "content", None)
-                    if candidate_content is not None:
-                        contents.append(candidate_content)
+                    if model_parts:
+                        history.append(types.Content(role="model", parts=model_parts))
 
-                    text = self._candidate_text(candidate)
+                    text = " ".join(
+                        part.text
+                        for part in model_parts
+                        if isinstance(getattr(part, "text", None), str) and part.text
+                    ).strip()
                     if text:
                         last_text = text
-                        yield self._sse_event(
-                            "assistant",
-                            {
-                                "session_id": session.session_id,
-                                "text": text,
-                                "turn": turn + 1,
-                            },
+
+                    if recorder is not None and observed_frame is not None:
+                        await self.workers.run(
+                            partial(
+                                recorder.record,
+                                url=observed_url,
+                                frame=observed_frame,
+                                content=types.Content(role="model", parts=model_parts),
+                                results=action_statuses,
+                                replayed=replay_step is not None,
+                            )
                         )
+                    if replay_step is None:
+                        self.metrics.model_call_seconds.observe(timings.seconds["model"])
+                    self.metrics.turns.inc()
 
-                    function_calls = self._candidate_function_calls(candidate)
-                    if not function_calls:
-                        final_state = await self._capture_state(session)
-                        yield self._sse_event(
+                    if not function_responses:
+                        final_state = await self._capture_state(
+                            session, include_ui=include_screenshots, timings=timings
+                        )
+                        if recorder is not None and recorder.live_turns > 0:
+                            # Only runs the model finished on its own are worth replaying.
+                            try:
+                                await self.trajectories.save(recorder.trajectory())
+                            except OSError:
+                                # A finished run is never failed by its recording.
+                                logger.warning("Could not save trajectory", exc_info=True)
+                        if self.timing_events:
+                            yield self._timing_event(session, turn, timings)
+                        yield RunEvent(
                             "done",
                             {
                                 "session_id": session.session_id,
                                 "response": last_text,
                                 "model": self.model,
+                                "replayed_turns": replayed_turns,
+                                "ui_bytes_saved": session.ui_bytes_saved,
+                                "model_bytes_saved": session.model_bytes_saved,
+                                "requests": session.requests.summary(),
                                 **final_state,
                             },
                         )
                         return
 
-                    function_responses: list[types.FunctionResponse] = []
-                    for function_call in function_calls:
-                        name = str(getattr(function_call, "name", "unknown"))
-                        raw_args = dict(getattr(function_call, "args", {}) or {})
-                        action_result = await self._execute_action(
-                            page=session.page,
-                            name=name,
-                            args=raw_args,
-                        )
-                        action_state = await self._capture_state(session)
-                        action_payload = {
-                            "session_id": session.session_id,
-                            "action": name,
-                            "args": self._safe_args(raw_args),
-                            **action_result,
-                            **action_state,
-                        }
-
-                        yield self._sse_event("action", action_payload)
-                        function_responses.append(
-                            self._build_function_response(name=name, payload=action_payload)
-                        )
-
-                    contents.append(
+                    if self.timing_events:
+                        yield self._timing_event(session, turn, timings)
+                    history.append(
                         types.Content(
                             role="user",
                             parts=[
@@ -473,28 +1681,198 @@ class GeminiComputerUseService:
                         )
                     )
 
-                final_state = await self._capture_state(session)
-                yield self._sse_event(
+                final_state = await self._capture_state(
+                    session, include_ui=include_screenshots
+                )
+                yield RunEvent(
                     "done",
                     {
                         "session_id": session.session_id,
                         "response": last_text or "Reached action limit before completion.",
                         "model": self.model,
+                        "replayed_turns": replayed_turns,
+                        "ui_bytes_saved": session.ui_bytes_saved,
+                        "model_bytes_saved": session.model_bytes_saved,
+                        "requests": session.requests.summary(),
                         **final_state,
                     },
                 )
+        except asyncio.CancelledError:
+            reason = session.stop_reason if session is not None else None
+            if reason is None:
+                raise
+            self.metrics.runs_cancelled.inc(reason=reason)
+            yield RunEvent(
+                "done",
+                {
+                    "session_id": session.session_id,
+                    "response": "Stopped before completion.",
+                    "model": self.model,
+                    "stopped": True,
+                    "url": session.last_url,
+                    "updated_at_ms": session.updated_at_ms,
+                },
+            )
         except GeminiComputerUseError as exc:
-            yield self._sse_event(
+            yield RunEvent(
                 "error",
                 {"session_id": session.session_id if session else session_id, "error": exc.error},
             )
         except Exception as exc:
-            error = self._normalize_error(
-                status_code=500,
-                message=f"Computer-use request failed: {exc}",
-                error_type="internal_error",
-            )
-            yield self._sse_event(
+            if session is not None and self._session_crashed(session):
+                error = self._crashed_error(session.session_id).error
+            else:
+                error = self._normalize_error(
+                    status_code=500,
+                    message=f"Computer-use request failed: {exc}",
+                    error_type="internal_error",
+                )
+            yield RunEvent(
                 "error",
                 {"session_id": session.session_id if session else session_id, "error": error},
             )
+        finally:
+            if session is not None and session.run_task is asyncio.current_task():
+                session.run_task = None
+            if ticket is not None:
+                ticket.release()
+
+    async def _run_batch_job(
+        self,
+        *,
+        index: int,
+        job: BatchJob,
+        result: dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        events: asyncio.Queue[tuple[int, RunEvent | None]],
+        buffered: asyncio.Semaphore,
+        include_screenshots: bool,
+        close_sessions: bool,
+    ) -> None:
+        turn_timings: list[PhaseTimings] = []
+        started_at = time.perf_counter()
+        try:
+            async with semaphore:
+                result["status"] = "running"
+                started_at = time.perf_counter()
+                run = self._run_instruction(
+                    message=job.message,
+                    session_id=job.session_id,
+                    max_turns=job.max_turns,
+                    include_screenshots=include_screenshots,
+                    start_url=job.start_url,
+                )
+                async with aclosing(self._paced(run, buffered)) as paced:
+                    async for run_event in paced:
+                        data = run_event.data
+                        if run_event.event == "session":
+                            result["session_id"] = data["session_id"]
+                        elif run_event.event == "action":
+                            result["actions"] += 1
+                        elif run_event.event == "done":
+                            result.update(status="done", response=data["response"], url=data["url"])
+                        elif run_event.event == "error":
+                            result.update(status="error", error=data["error"])
+                        timings = run_event.timings
+                        if timings is not None and not any(seen is timings for seen in turn_timings):
+                            turn_timings.append(timings)
+                        if not include_screenshots and "screenshot_mime_type" in data:
+                            # The opening frame is always captured; batch callers opt in to pixels.
+                            data = {
+                                key: value
+                                for key, value in data.items()
+                                if key not in _SCREENSHOT_PAYLOAD_KEYS
+                            }
+                            run_event = RunEvent(run_event.event, data, timings)
+                        events.put_nowait((index, run_event))
+        finally:
+            result["elapsed_ms"] = round((time.perf_counter() - started_at) * 1000, 1)
+            result["phases_ms"] = {
+                phase: round(sum(timings.seconds[phase] for timings in turn_timings) * 1000, 1)
+                for phase in PhaseTimings.PHASES
+            }
+            session_id = result.get("session_id")
+            if close_sessions and job.session_id is None and session_id:
+                # Batch sessions are throwaway; free their browser capacity right away.
+                await self.close_session(session_id)
+            events.put_nowait((index, None))
+
+    async def stream_batch(
+        self,
+        *,
+        jobs: list[BatchJob],
+        max_concurrency: int | None = None,
+        include_screenshots: bool = False,
+        close_sessions: bool = True,
+    ) -> AsyncIterator[str]:
+        batch_id = str(uuid.uuid4())
+        started_at = time.perf_counter()
+        concurrency = max_concurrency or self.batch_max_concurrency
+        if self._run_limiter.limit > 0:
+            # Never hold more jobs than admission can run, so batches do not fill the queue.
+            concurrency = min(concurrency, self._run_limiter.limit)
+        concurrency = max(1, concurrency)
+        semaphore = asyncio.Semaphore(concurrency)
+        events: asyncio.Queue[tuple[int, RunEvent | None]] = asyncio.Queue()
+        # Shared by the running jobs, so a slow client holds back the whole batch instead
+        # of letting events pile up; each job's closing None skips it.
+        buffered = asyncio.Semaphore(_RUN_EVENT_BUFFER * concurrency)
+        results: list[dict[str, Any]] = [
+            {"job": index, "status": "pending", "session_id": job.session_id, "actions": 0}
+            for index, job in enumerate(jobs)
+        ]
+
+        yield await self._emit(
+            "batch",
+            {"batch_id": batch_id, "jobs": len(jobs), "max_concurrency": concurrency},
+        )
+        tasks = [
+            asyncio.create_task(
+                self._run_batch_job(
+                    index=index,
+                    job=job,
+                    result=results[index],
+                    semaphore=semaphore,
+                    events=events,
+                    buffered=buffered,
+                    include_screenshots=include_screenshots,
+                    close_sessions=close_sessions,
+                )
+            )
+            for index, job in enumerate(jobs)
+        ]
+        try:
+            remaining = len(tasks)
+            while remaining:
+                index, run_event = await events.get()
+                if run_event is None:
+                    remaining -= 1
+                    continue
+                buffered.release()
+                yield await self._emit(
+                    run_event.event,
+                    {"batch_id": batch_id, "job": index, **run_event.data},
+                    run_event.timings,
+                )
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        job_ms = [result["elapsed_ms"] for result in results]
+        yield await self._emit(
+            "batch_done",
+            {
+                "batch_id": batch_id,
+                "succeeded": sum(1 for result in results if result["status"] == "done"),
+                "failed": sum(1 for result in results if result["status"] != "done"),
+                "elapsed_ms": round((time.perf_counter() - started_at) * 1000, 1),
+                "job_ms_p50": statistics.median(job_ms) if job_ms else 0,
+                "job_ms_max": max(job_ms, default=0),
+                "phases_ms": {
+                    phase: round(sum(result["phases_ms"][phase] for result in results), 1)
+                    for phase in PhaseTimings.PHASES
+                },
+                "results": results,
+            },
+        )
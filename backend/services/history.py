@@ -0,0 +1,147 @@
+from collections import deque
+from typing import Any
+
+from google.genai import types
+
+SCREENSHOT_STUB = "[Earlier screenshot omitted to bound context size.]"
+INTERRUPTED_STUB = "[Stopped before finishing this instruction.]"
+
+
+class ConversationHistory:
+    def __init__(
+        self,
+        *,
+        max_screenshots: int,
+        contents: list[types.Content] | None = None,
+    ) -> None:
+        # max_screenshots <= 0 keeps every screenshot.
+        self.max_screenshots = max_screenshots
+        self.contents: list[types.Content] = []
+        self.image_bytes = 0
+        self.pruned_images = 0
+        self.pruned_bytes = 0
+        # Contents before this index belong to earlier instructions and no longer change.
+        self.prefix_length = 0
+        self._images: deque[tuple[int, int, int]] = deque()
+        for content in contents or []:
+            self.append(content)
+
+    @staticmethod
+    def _part_image_bytes(part: types.Part) -> int:
+        inline_data = part.inline_data
+        if inline_data is not None and inline_data.data:
+            return len(inline_data.data)
+
+        function_response = part.function_response
+        if function_response is None or not function_response.parts:
+            return 0
+        total = 0
+        for response_part in function_response.parts:
+            blob = response_part.inline_data
+            if blob is not None and blob.data:
+                total += len(blob.data)
+        return total
+
+    @staticmethod
+    def _stub_part(part: types.Part) -> types.Part:
+        function_response = part.function_response
+        if function_response is None:
+            return types.Part(text=SCREENSHOT_STUB)
+
+        # Keep the response paired with its function call; only the image goes.
+        response: dict[str, Any] = dict(function_response.response or {})
+        response["screenshot"] = "omitted"
+        return types.Part(
+            function_response=types.FunctionResponse(
+                id=function_response.id,
+                name=function_response.name,
+                response=response,
+            )
+        )
+
+    def append(self, content: types.Content) -> None:
+        content_index = len(self.contents)
+        self.contents.append(content)
+        if content.role != "user":
+            return
+
+        for part_index, part in enumerate(content.parts or []):
+            size = self._part_image_bytes(part)
+            if size:
+                self._images.append((content_index, part_index, size))
+                self.image_bytes += size
+        self._prune()
+
+    @staticmethod
+    def _starts_instruction(content: types.Content) -> bool:
+        return content.role == "user" and any(
+            part.function_response is None for part in content.parts or []
+        )
+
+    @staticmethod
+    def _has_pending_calls(content: types.Content) -> bool:
+        return content.role == "model" and any(
+            part.function_call is not None for part in content.parts or []
+        )
+
+    def _reindex(self) -> None:
+        self._images.clear()
+        self.image_bytes = 0
+        for content_index, content in enumerate(self.contents):
+            if content.role != "user":
+                continue
+            for part_index, part in enumerate(content.parts or []):
+                size = self._part_image_bytes(part)
+                if size:
+                    self._images.append((content_index, part_index, size))
+                    self.image_bytes += size
+
+    def start_instruction(self, content: types.Content, *, max_instructions: int) -> None:
+        # Runs that errored or hit the turn limit end mid-exchange. Drop calls that
+        # never got a response and close the exchange so the roles still alternate.
+        while self.contents and self._has_pending_calls(self.contents[-1]):
+            self.contents.pop()
+        if self.contents and self.contents[-1].role == "user":
+            self.contents.append(types.Content(role="model", parts=[types.Part(text=INTERRUPTED_STUB)]))
+        starts = [
+            index
+            for index, previous in enumerate(self.contents)
+            if self._starts_instruction(previous)
+        ]
+        keep = max(0, max_instructions - 1)
+        cut = len(self.contents) if keep == 0 else (starts[-keep] if len(starts) >= keep else 0)
+        del self.contents[:cut]
+        self._reindex()
+        # Earlier screenshots are stale once a new one is taken, and stubbing them
+        # keeps the prefix stable for the rest of the instruction.
+        self.stub_images()
+        self.prefix_length = len(self.contents)
+        self.append(content)
+
+    def stub_images(self) -> None:
+        self._stub_oldest(len(self._images))
+
+    def _prune(self) -> None:
+        if self.max_screenshots <= 0:
+            return
+        self._stub_oldest(len(self._images) - self.max_screenshots)
+
+    def _stub_oldest(self, count: int) -> None:
+        for _ in range(max(0, count)):
+            content_index, part_index, size = self._images.popleft()
+            content = self.contents[content_index]
+            parts = list(content.parts or [])
+            parts[part_index] = self._stub_part(parts[part_index])
+            self.contents[content_index] = types.Content(role=content.role, parts=parts)
+            self.image_bytes -= size
+            self.pruned_images += 1
+            self.pruned_bytes += size
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "contents": len(self.contents),
+            "images": len(self._images),
+            "image_bytes": self.image_bytes,
+            "pruned_images": self.pruned_images,
+            "pruned_bytes": self.pruned_bytes,
+        }
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+_MAX_AGE = re.compile(r"(?:^|,)\s*max-age\s*=\s*(\d+)", re.IGNORECASE)
+# Headers describing the wire encoding; cached bodies are stored decoded.
+_CREDENTIAL_HEADERS = {"cookie", "authorization"}
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "set-cookie", "date", "age"}
+
+
+def _body_digest(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+@dataclass
+class CachedResponse:
+    status: int
+    headers: dict[str, str]
+    body: bytes
+
+
+class HttpCache:
+    def __init__(
+        self,
+        directory: str,
+        *,
+        max_bytes: int,
+        default_ttl_s: int,
+        max_entry_bytes: int = 5 * 1024 * 1024,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.default_ttl_s = default_ttl_s
+        self.max_entry_bytes = max_entry_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._size = sum(path.stat().st_size for path in self.directory.glob("*.body"))
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.directory / f"{key}.json", self.directory / f"{key}.body"
+
+    def ttl_s(self, headers: dict[str, str], request_headers: dict[str, str]) -> int | None:
+        lowered = {name.lower(): value for name, value in headers.items()}
+        cache_control = lowered.get("cache-control", "").lower()
+        directives = {token.split("=", 1)[0].strip() for token in cache_control.split(",")}
+        if directives & {"no-store", "no-cache", "private"}:
+            return None
+        # The cache is shared by every session: a response to a credentialed request, or
+        # one setting a cookie, belongs to one user unless the origin marks it public.
+        credentialed = "set-cookie" in lowered or any(
+            name.lower() in _CREDENTIAL_HEADERS for name in request_headers
+        )
+        if credentialed and "public" not in directives:
+            return None
+        vary = lowered.get("vary", "").strip().lower()
+        if vary and vary != "accept-encoding":
+            return None
+        match = _MAX_AGE.search(cache_control)
+        if match is not None:
+            return int(match.group(1)) or None
+        return self.default_ttl_s
+
+    def get(self, url: str) -> CachedResponse | None:
+        meta_path, body_path = self._paths(url)
+        try:
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if meta["expires_at"] < time.time():
+                return None
+            body = body_path.read_bytes()
+        except (OSError, ValueError, KeyError):
+            return None
+        # Overlapping puts of one URL can leave a body beside the other response's metadata.
+        if meta.get("body_digest") != _body_digest(body):
+            return None
+        # Touch for LRU eviction.
+        try:
+            os.utime(body_path)
+        except OSError:
+            pass
+        return CachedResponse(status=meta["status"], headers=meta["headers"], body=body)
+
+    def put(
+        self,
+        url: str,
+        *,
+        status: int,
+        headers: dict[str, str],
+        body: bytes,
+        request_headers: dict[str, str],
+    ) -> bool:
+        ttl_s = self.ttl_s(headers, request_headers)
+        if status != 200 or ttl_s is None or len(body) > self.max_entry_bytes:
+            return False
+        meta_path, body_path = self._paths(url)
+        meta = {
+            "url": url,
+            "status": status,
+            "headers": {
+                name: value for name, value in headers.items() if name.lower() not in _DROPPED_HEADERS
+            },
+            "expires_at": time.time() + ttl_s,
+            "body_digest": _body_digest(body),
+        }
+        try:
+            previous_size = body_path.stat().st_size
+        except OSError:
+            previous_size = 0
+        # Body first, then metadata: a reader never sees metadata without its body.
+        self._replace(body_path, body)
+        self._replace(meta_path, json.dumps(meta, separators=(",", ":")).encode("utf-8"))
+        self._size += len(body) - previous_size
+        if self._size > self.max_bytes:
+            self._evict()
+        return True
+
+    def _replace(self, path: Path, data: bytes) -> None:
+        # Puts run on worker threads; unique temp names keep concurrent writers apart.
+        fd, temp_name = tempfile.mkstemp(dir=self.directory, prefix=f"{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(data)
+            os.replace(temp_name, path)
+        except BaseException:
+            try:
+                os.unlink(temp_name)
+            except OSError:
+                pass
+            raise
+
+    def _evict(self) -> None:
+        bodies = []
+        for path in self.directory.glob("*.body"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            bodies.append((stat.st_mtime, stat.st_size, path))
+        bodies.sort()
+        self._size = sum(size for _, size, _ in bodies)
+        # Trim to 90% so eviction does not run on every store near the limit.
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in bodies:
+            if self._size <= target:
+                break
+            for stale in (path, path.with_suffix(".json")):
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass
+            self._size -= size
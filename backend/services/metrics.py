@@ -0,0 +1,311 @@
+import bisect
+import math
+import time
+from typing import Callable
+
+LabelKey = tuple[str, ...]
+
+LATENCY_BUCKETS_S = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS_BYTES = (1e3, 1e4, 5e4, 1e5, 2.5e5, 5e5, 1e6, 2.5e6, 5e6)
+LAG_BUCKETS_S = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: tuple[str, ...], values: LabelKey, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+
+    def _key(self, labels: dict[str, str]) -> LabelKey:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, read: Callable[[], float]) -> None:
+        super().__init__(name, help_text)
+        self._read = read
+
+    def samples(self) -> list[str]:
+        return [f"{self.name} {_format_value(float(self._read()))}"]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS_S,
+    ) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (last slot is +Inf), sum, count.
+        self._series: dict[LabelKey, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        series = self._series.get(key)
+        if series is None:
+            series = ([0] * (len(self.buckets) + 1), [0.0, 0.0])
+            self._series[key] = series
+        counts, totals = series
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        totals[0] += value
+        totals[1] += 1
+
+    def samples(self) -> list[str]:
+        lines: list[str] = []
+        for key, (counts, totals) in self._series.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(totals[0])}")
+            lines.append(f"{self.name}_count{labels} {_format_value(totals[1])}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, read: Callable[[], float]) -> Gauge:
+        return self._register(Gauge(name, help_text, read))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS_S,
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+class PhaseTimings:
+    PHASES = ("model", "action", "settle", "capture", "encode")
+
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.seconds = dict.fromkeys(self.PHASES, 0.0)
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.seconds[phase] += max(0.0, seconds)
+
+    def since(self, phase: str, started_at: float) -> float:
+        elapsed = time.perf_counter() - started_at
+        self.add(phase, elapsed)
+        return elapsed
+
+    def as_ms(self) -> dict[str, float]:
+        phases_ms = {phase: round(value * 1000, 1) for phase, value in self.seconds.items()}
+        phases_ms["total"] = round((time.perf_counter() - self.started_at) * 1000, 1)
+        return phases_ms
+
+
+class OperatorMetrics:
+    def __init__(self) -> None:
+        self.registry = MetricsRegistry()
+        registry = self.registry
+        self.model_call_seconds = registry.histogram(
+            "operator_model_call_seconds",
+            "Time spent waiting on the model per turn, excluding action execution.",
+        )
+        self.model_first_chunk_seconds = registry.histogram(
+            "operator_model_first_chunk_seconds",
+            "Time from model request to the first streamed chunk.",
+        )
+        self.model_errors = registry.counter(
+            "operator_model_errors_total",
+            "Model calls that failed.",
+        )
+        self.actions = registry.counter(
+            "operator_actions_total",
+            "Browser actions executed by name and status.",
+            ("action", "status"),
+        )
+        self.action_seconds = registry.histogram(
+            "operator_action_seconds",
+            "Browser action execution time, excluding settle.",
+            ("action",),
+        )
+        self.settle_seconds = registry.histogram(
+            "operator_settle_seconds",
+            "Post-action settle time by strategy.",
+            ("strategy",),
+        )
+        self.capture_seconds = registry.histogram(
+            "operator_capture_seconds",
+            "Screenshot capture time per state capture.",
+        )
+        self.capture_bytes = registry.histogram(
+            "operator_capture_bytes",
+            "Captured frame size by consumer.",
+            ("target",),
+            SIZE_BUCKETS_BYTES,
+        )
+        self.encode_seconds = registry.histogram(
+            "operator_encode_seconds",
+            "Frame and SSE encoding time per event.",
+        )
+        self.loop_lag_seconds = registry.histogram(
+            "operator_event_loop_lag_seconds",
+            "How late the event loop woke a periodic timer; high values mean blocking work on the loop.",
+            buckets=LAG_BUCKETS_S,
+        )
+        self.frames_unchanged = registry.counter(
+            "operator_frames_unchanged_total",
+            "Captures identical to the previous frame by consumer.",
+            ("target",),
+        )
+        self.frame_bytes_saved = registry.counter(
+            "operator_frame_bytes_saved_total",
+            "Bytes not sent because a frame was unchanged, by consumer.",
+            ("target",),
+        )
+        self.sse_events = registry.counter(
+            "operator_sse_events_total",
+            "SSE events emitted by type.",
+            ("event",),
+        )
+        self.sse_bytes = registry.counter(
+            "operator_sse_bytes_total",
+            "SSE bytes emitted.",
+        )
+        self.turns = registry.counter(
+            "operator_turns_total",
+            "Model turns completed.",
+        )
+        self.replay_turns = registry.counter(
+            "operator_replay_turns_total",
+            "Turns served from a recorded trajectory, and replays that diverged.",
+            ("outcome",),
+        )
+        self.context_cache = registry.counter(
+            "operator_context_cache_total",
+            "Provider context caches created for a session's earlier turns, and failed attempts.",
+            ("result",),
+        )
+        self.runs_cancelled = registry.counter(
+            "operator_runs_cancelled_total",
+            "Runs cut short by a stop request, a deleted session or a client disconnect.",
+            ("reason",),
+        )
+        self.runs_rejected = registry.counter(
+            "operator_runs_rejected_total",
+            "Instructions rejected because the admission queue was full.",
+        )
+        self.admission_wait_seconds = registry.histogram(
+            "operator_admission_wait_seconds",
+            "Time instructions spent queued for admission.",
+        )
+        self.provider_retries = registry.counter(
+            "operator_provider_retries_total",
+            "Model requests retried after a provider rate limit or overload, by status code.",
+            ("code",),
+        )
+        self.requests_blocked = registry.counter(
+            "operator_requests_blocked_total",
+            "Browser requests aborted by the routing layer, by resource type.",
+            ("resource_type",),
+        )
+        self.http_cache_requests = registry.counter(
+            "operator_http_cache_requests_total",
+            "Static asset requests handled by the shared HTTP cache, by result.",
+            ("result",),
+        )
+        self.http_cache_bytes_served = registry.counter(
+            "operator_http_cache_bytes_served_total",
+            "Bytes served from the shared HTTP cache instead of the network.",
+        )
+        self.sessions_spilled = registry.counter(
+            "operator_sessions_spilled_total",
+            "Idle sessions written to disk and closed, by reason.",
+            ("reason",),
+        )
+        self.sessions_restored = registry.counter(
+            "operator_sessions_restored_total",
+            "Spilled sessions reopened from disk.",
+        )
+        self.requests_forwarded = registry.counter(
+            "operator_requests_forwarded_total",
+            "Requests for a session held by another worker, by result.",
+            ("result",),
+        )
+        self.sessions_evicted = registry.counter(
+            "operator_sessions_evicted_total",
+            "Sessions closed by the server, by reason.",
+            ("reason",),
+        )
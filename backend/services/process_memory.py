@@ -0,0 +1,42 @@
+import os
+
+
+def _read_rss_pages(pid: int) -> int:
+    with open(f"/proc/{pid}/statm", "r", encoding="ascii") as handle:
+        return int(handle.read().split()[1])
+
+
+def _child_pids() -> dict[int, list[int]]:
+    children: dict[int, list[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r", encoding="ascii", errors="replace") as handle:
+                stat = handle.read()
+        except OSError:
+            continue
+        # The command name may contain spaces, so parse after its closing paren.
+        fields = stat.rsplit(")", 1)[-1].split()
+        if len(fields) > 1:
+            children.setdefault(int(fields[1]), []).append(int(entry))
+    return children
+
+
+def process_tree_rss_bytes(root_pid: int | None = None) -> int | None:
+    # Chromium runs as child processes, so the budget covers the whole tree.
+    if not os.path.isdir("/proc"):
+        return None
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    children = _child_pids()
+    pending = [root_pid if root_pid is not None else os.getpid()]
+    total_pages = 0
+    while pending:
+        pid = pending.pop()
+        try:
+            total_pages += _read_rss_pages(pid)
+        except (OSError, ValueError, IndexError):
+            continue
+        pending.extend(children.get(pid, []))
+    return total_pages * page_size
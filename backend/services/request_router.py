@@ -0,0 +1,139 @@
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from urllib.parse import urlsplit
+
+from playwright.async_api import BrowserContext, Route
+
+from services.http_cache import HttpCache
+from services.metrics import OperatorMetrics
+
+_CACHEABLE_RESOURCE_TYPES = {"stylesheet", "script", "font", "image"}
+
+
+def _parse_list(raw: str | None) -> frozenset[str]:
+    return frozenset(item.strip().lower() for item in (raw or "").split(",") if item.strip())
+
+
+def _host(url: str) -> str:
+    return (urlsplit(url).hostname or "").lower()
+
+
+@dataclass
+class SiteRequestStats:
+    blocked: int = 0
+    cache_hits: int = 0
+    cache_bytes: int = 0
+
+
+@dataclass
+class RequestStats:
+    max_sites: int = 50
+    sites: OrderedDict[str, SiteRequestStats] = field(default_factory=OrderedDict)
+
+    def for_site(self, site: str) -> SiteRequestStats:
+        stats = self.sites.pop(site, None) or SiteRequestStats()
+        self.sites[site] = stats
+        while len(self.sites) > self.max_sites:
+            self.sites.popitem(last=False)
+        return stats
+
+    def summary(self) -> dict[str, dict[str, int]]:
+        return {
+            site: {
+                "blocked": stats.blocked,
+                "cache_hits": stats.cache_hits,
+                "cache_bytes": stats.cache_bytes,
+            }
+            for site, stats in self.sites.items()
+        }
+
+
+class RequestRouter:
+    def __init__(
+        self,
+        *,
+        blocked_resource_types: str | None,
+        blocked_domains: str | None,
+        cache: HttpCache | None,
+        metrics: OperatorMetrics,
+    ) -> None:
+        self.blocked_resource_types = _parse_list(blocked_resource_types)
+        self.blocked_domains = _parse_list(blocked_domains)
+        self.cache = cache
+        self.metrics = metrics
+
+    @property
+    def enabled(self) -> bool:
+        # Routing turns off Chromium's own HTTP cache, so only install it when it pays off.
+        return bool(self.blocked_resource_types or self.blocked_domains or self.cache)
+
+    def _blocked_domain(self, host: str) -> bool:
+        return any(host == domain or host.endswith(f".{domain}") for domain in self.blocked_domains)
+
+    async def install(self, context: BrowserContext, stats: RequestStats) -> None:
+        if not self.enabled:
+            return
+
+        async def handle(route: Route) -> None:
+            await self._handle(route, stats)
+
+        await context.route("**/*", handle)
+
+    @staticmethod
+    def _site(route: Route) -> str:
+        try:
+            return _host(route.request.frame.page.url) or "unknown"
+        except Exception:
+            return "unknown"
+
+    async def _handle(self, route: Route, stats: RequestStats) -> None:
+        request = route.request
+        resource_type = request.resource_type
+        is_document = request.is_navigation_request() and resource_type == "document"
+        if not is_document and (
+            resource_type in self.blocked_resource_types
+            or self._blocked_domain(_host(request.url))
+        ):
+            stats.for_site(self._site(route)).blocked += 1
+            self.metrics.requests_blocked.inc(resource_type=resource_type)
+            await route.abort("blockedbyclient")
+            return
+
+        if (
+            self.cache is None
+            or request.method != "GET"
+            or resource_type not in _CACHEABLE_RESOURCE_TYPES
+        ):
+            await route.continue_()
+            return
+
+        cached = await asyncio.to_thread(self.cache.get, request.url)
+        if cached is not None:
+            site_stats = stats.for_site(self._site(route))
+            site_stats.cache_hits += 1
+            site_stats.cache_bytes += len(cached.body)
+            self.metrics.http_cache_requests.inc(result="hit")
+            self.metrics.http_cache_bytes_served.inc(len(cached.body))
+            await route.fulfill(status=cached.status, headers=cached.headers, body=cached.body)
+            return
+
+        try:
+            # all_headers includes the Cookie and Authorization headers the cache checks.
+            request_headers = await request.all_headers()
+            response = await route.fetch()
+            body = await response.body()
+        except Exception:
+            self.metrics.http_cache_requests.inc(result="error")
+            await route.continue_()
+            return
+        await route.fulfill(response=response, body=body)
+        stored = await asyncio.to_thread(
+            self.cache.put,
+            request.url,
+            status=response.status,
+            headers=response.headers,
+            body=body,
+            request_headers=request_headers,
+        )
+        self.metrics.http_cache_requests.inc(result="store" if stored else "uncacheable")
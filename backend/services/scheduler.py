@@ -0,0 +1,131 @@
+import asyncio
+import random
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Hashable
+
+
+class QueueFull(Exception):
+    pass
+
+
+class Ticket:
+    def __init__(self, limiter: "FairLimiter", key: Hashable) -> None:
+        self.limiter = limiter
+        self.key = key
+        self.granted = False
+        self.released = False
+        self.future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+
+    async def wait(self) -> None:
+        if not self.granted:
+            await asyncio.shield(self.future)
+
+    def release(self) -> None:
+        self.limiter._release(self)
+
+
+class FairLimiter:
+    # Caps concurrent holders and serves waiters round-robin by key, so one busy
+    # session cannot starve the others. A limit of 0 disables the cap.
+    def __init__(self, limit: int, *, max_waiters: int = -1) -> None:
+        self.limit = max(0, limit)
+        self.max_waiters = max_waiters
+        self.in_use = 0
+        self._waiters: OrderedDict[Hashable, deque[Ticket]] = OrderedDict()
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(queue) for queue in self._waiters.values())
+
+    def full(self) -> bool:
+        return (
+            self.limit > 0
+            and self.in_use >= self.limit
+            and self.max_waiters >= 0
+            and self.waiting >= self.max_waiters
+        )
+
+    def enqueue(self, key: Hashable) -> Ticket:
+        ticket = Ticket(self, key)
+        if self.limit <= 0 or (self.in_use < self.limit and not self._waiters):
+            self._grant(ticket)
+            return ticket
+        if self.full():
+            raise QueueFull()
+        self._waiters.setdefault(key, deque()).append(ticket)
+        return ticket
+
+    def position(self, ticket: Ticket) -> int:
+        if ticket.granted:
+            return 0
+        queue = self._waiters.get(ticket.key)
+        if queue is None or ticket not in queue:
+            return 0
+        depth = queue.index(ticket)
+        ahead = 0
+        before = True
+        # Round-robin: every key ahead of ours in rotation gets one extra turn first.
+        for key, other in self._waiters.items():
+            if key == ticket.key:
+                ahead += depth
+                before = False
+            else:
+                ahead += min(len(other), depth + (1 if before else 0))
+        return ahead + 1
+
+    async def positions(self, ticket: Ticket, *, interval_s: float = 1.0) -> AsyncIterator[int]:
+        last_position = None
+        while not ticket.granted:
+            position = self.position(ticket)
+            if position != last_position:
+                last_position = position
+                yield position
+            try:
+                await asyncio.wait_for(asyncio.shield(ticket.future), interval_s)
+            except asyncio.TimeoutError:
+                pass
+
+    @asynccontextmanager
+    async def slot(self, key: Hashable) -> AsyncIterator[None]:
+        ticket = self.enqueue(key)
+        try:
+            await ticket.wait()
+            yield
+        finally:
+            ticket.release()
+
+    def _grant(self, ticket: Ticket) -> None:
+        ticket.granted = True
+        self.in_use += 1
+        if not ticket.future.done():
+            ticket.future.set_result(None)
+
+    def _dispatch(self) -> None:
+        while self._waiters and (self.limit <= 0 or self.in_use < self.limit):
+            key, queue = self._waiters.popitem(last=False)
+            ticket = queue.popleft()
+            if queue:
+                self._waiters[key] = queue
+            self._grant(ticket)
+
+    def _release(self, ticket: Ticket) -> None:
+        if ticket.released:
+            return
+        ticket.released = True
+        if ticket.granted:
+            self.in_use -= 1
+            self._dispatch()
+            return
+        queue = self._waiters.get(ticket.key)
+        if queue is not None and ticket in queue:
+            queue.remove(ticket)
+            if not queue:
+                del self._waiters[ticket.key]
+        if not ticket.future.done():
+            ticket.future.cancel()
+
+
+def backoff_delay_s(attempt: int, *, base_s: float, cap_s: float) -> float:
+    # Full jitter keeps concurrent retries from re-synchronizing against the provider.
+    return random.uniform(0, min(cap_s, base_s * (2 ** attempt)))
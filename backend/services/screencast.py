@@ -0,0 +1,133 @@
+import asyncio
+import base64
+import time
+from typing import Any
+
+from playwright.async_api import CDPSession, Page
+
+
+class Screencast:
+    def __init__(
+        self,
+        *,
+        max_fps: float,
+        quality: int,
+        max_width: int,
+        max_height: int,
+        viewer_stall_s: float = 1.0,
+    ) -> None:
+        self.min_interval_s = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.quality = quality
+        self.max_width = max_width
+        self.max_height = max_height
+        self.viewer_stall_s = viewer_stall_s
+        self.frames_received = 0
+        self.frames_dropped = 0
+        self._page: Page | None = None
+        self._cdp: CDPSession | None = None
+        self._viewers: set[asyncio.Queue[bytes]] = set()
+        self._latest: bytes | None = None
+        self._last_frame_at = 0.0
+        self._ack_task: asyncio.Task[None] | None = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def viewers(self) -> int:
+        return len(self._viewers)
+
+    async def _start(self) -> None:
+        if self._cdp is not None or self._page is None or self._page.is_closed():
+            return
+        cdp = await self._page.context.new_cdp_session(self._page)
+        cdp.on("Page.screencastFrame", self._on_frame)
+        self._cdp = cdp
+        await cdp.send(
+            "Page.startScreencast",
+            {
+                "format": "jpeg",
+                "quality": self.quality,
+                "maxWidth": self.max_width,
+                "maxHeight": self.max_height,
+                "everyNthFrame": 1,
+            },
+        )
+
+    async def _stop(self) -> None:
+        cdp, self._cdp = self._cdp, None
+        if self._ack_task is not None:
+            self._ack_task.cancel()
+            self._ack_task = None
+        if cdp is None:
+            return
+        try:
+            await cdp.send("Page.stopScreencast")
+            await cdp.detach()
+        except Exception:
+            pass
+
+    async def bind(self, page: Page) -> None:
+        async with self._lock:
+            if page is self._page:
+                return
+            await self._stop()
+            self._page = page
+            if self._viewers:
+                await self._start()
+
+    async def subscribe(self) -> asyncio.Queue[bytes]:
+        queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=1)
+        async with self._lock:
+            self._viewers.add(queue)
+            if self._latest is not None:
+                queue.put_nowait(self._latest)
+            await self._start()
+        return queue
+
+    async def unsubscribe(self, queue: asyncio.Queue[bytes]) -> None:
+        async with self._lock:
+            self._viewers.discard(queue)
+            if not self._viewers:
+                await self._stop()
+
+    async def close(self) -> None:
+        async with self._lock:
+            # An empty frame tells viewers the session is gone.
+            for queue in self._viewers:
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(b"")
+            self._viewers.clear()
+            await self._stop()
+            self._page = None
+
+    def _on_frame(self, params: dict[str, Any]) -> None:
+        cdp = self._cdp
+        if cdp is None:
+            return
+        frame = base64.b64decode(params.get("data", ""))
+        self.frames_received += 1
+        self._latest = frame
+        self._last_frame_at = time.monotonic()
+        for queue in self._viewers:
+            if queue.full():
+                # Viewers only ever want the newest frame.
+                queue.get_nowait()
+                self.frames_dropped += 1
+            queue.put_nowait(frame)
+        self._ack_task = asyncio.get_running_loop().create_task(
+            self._ack(cdp, params.get("sessionId"))
+        )
+
+    async def _ack(self, cdp: CDPSession, frame_session_id: Any) -> None:
+        # Chromium sends no new frame until this ack, which caps the frame rate and
+        # holds production back while viewers are still draining the last frame.
+        deadline = time.monotonic() + self.viewer_stall_s
+        while time.monotonic() < deadline and any(not queue.empty() for queue in self._viewers):
+            await asyncio.sleep(0.01)
+        remaining_s = self.min_interval_s - (time.monotonic() - self._last_frame_at)
+        if remaining_s > 0:
+            await asyncio.sleep(remaining_s)
+        try:
+            await cdp.send("Page.screencastFrameAck", {"sessionId": frame_session_id})
+        except Exception:
+            pass
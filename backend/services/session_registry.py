@@ -0,0 +1,166 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    heartbeat_at_ms INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    worker_id TEXT NOT NULL,
+    claimed_at_ms INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_worker ON sessions (worker_id);
+"""
+
+
+@dataclass(frozen=True)
+class SessionOwner:
+    worker_id: str
+    url: str
+
+
+class SessionRegistry(Protocol):
+    # Records which worker holds each live session. Owners whose heartbeat is older
+    # than stale_after_s are treated as gone, so their sessions can be claimed.
+    async def heartbeat(self, worker_id: str, url: str) -> None: ...
+
+    async def claim(self, session_id: str, worker_id: str, *, stale_after_s: float) -> bool: ...
+
+    async def owner(self, session_id: str, *, stale_after_s: float) -> SessionOwner | None: ...
+
+    async def release(self, session_id: str, worker_id: str) -> None: ...
+
+    async def remove_worker(self, worker_id: str) -> None: ...
+
+    async def prune(self, max_age_s: float) -> int: ...
+
+    async def close(self) -> None: ...
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class SqliteSessionRegistry:
+    # One database file shared by every worker on a host (or on a shared volume).
+    def __init__(self, path: str) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            self.path,
+            timeout=5.0,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def _heartbeat(self, worker_id: str, url: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO workers (worker_id, url, heartbeat_at_ms) VALUES (?, ?, ?) "
+                "ON CONFLICT (worker_id) DO UPDATE SET url = excluded.url, "
+                "heartbeat_at_ms = excluded.heartbeat_at_ms",
+                (worker_id, url, _now_ms()),
+            )
+
+    def _claim(self, session_id: str, worker_id: str, stale_after_s: float) -> bool:
+        cutoff_ms = _now_ms() - int(stale_after_s * 1000)
+        with self._lock:
+            # IMMEDIATE takes the write lock up front so two workers cannot both claim.
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT s.worker_id, w.heartbeat_at_ms FROM sessions s "
+                    "LEFT JOIN workers w ON w.worker_id = s.worker_id WHERE s.session_id = ?",
+                    (session_id,),
+                ).fetchone()
+                if row is not None and row[0] != worker_id and (row[1] or 0) >= cutoff_ms:
+                    self._db.execute("COMMIT")
+                    return False
+                self._db.execute(
+                    "INSERT INTO sessions (session_id, worker_id, claimed_at_ms) VALUES (?, ?, ?) "
+                    "ON CONFLICT (session_id) DO UPDATE SET worker_id = excluded.worker_id, "
+                    "claimed_at_ms = excluded.claimed_at_ms",
+                    (session_id, worker_id, _now_ms()),
+                )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return True
+
+    def _owner(self, session_id: str, stale_after_s: float) -> SessionOwner | None:
+        cutoff_ms = _now_ms() - int(stale_after_s * 1000)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT w.worker_id, w.url FROM sessions s "
+                "JOIN workers w ON w.worker_id = s.worker_id "
+                "WHERE s.session_id = ? AND w.heartbeat_at_ms >= ?",
+                (session_id, cutoff_ms),
+            ).fetchone()
+        return SessionOwner(worker_id=row[0], url=row[1]) if row else None
+
+    def _release(self, session_id: str, worker_id: str) -> None:
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM sessions WHERE session_id = ? AND worker_id = ?",
+                (session_id, worker_id),
+            )
+
+    def _remove_worker(self, worker_id: str) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM sessions WHERE worker_id = ?", (worker_id,))
+            self._db.execute("DELETE FROM workers WHERE worker_id = ?", (worker_id,))
+
+    def _prune(self, max_age_s: float) -> int:
+        # Workers that died without a graceful shutdown leave their rows behind.
+        cutoff_ms = _now_ms() - int(max_age_s * 1000)
+        with self._lock:
+            removed = self._db.execute(
+                "DELETE FROM sessions WHERE worker_id NOT IN "
+                "(SELECT worker_id FROM workers WHERE heartbeat_at_ms >= ?)",
+                (cutoff_ms,),
+            ).rowcount
+            self._db.execute("DELETE FROM workers WHERE heartbeat_at_ms < ?", (cutoff_ms,))
+        return removed
+
+    async def heartbeat(self, worker_id: str, url: str) -> None:
+        await asyncio.to_thread(self._heartbeat, worker_id, url)
+
+    async def claim(self, session_id: str, worker_id: str, *, stale_after_s: float) -> bool:
+        return await asyncio.to_thread(self._claim, session_id, worker_id, stale_after_s)
+
+    async def owner(self, session_id: str, *, stale_after_s: float) -> SessionOwner | None:
+        return await asyncio.to_thread(self._owner, session_id, stale_after_s)
+
+    async def release(self, session_id: str, worker_id: str) -> None:
+        await asyncio.to_thread(self._release, session_id, worker_id)
+
+    async def remove_worker(self, worker_id: str) -> None:
+        await asyncio.to_thread(self._remove_worker, worker_id)
+
+    async def prune(self, max_age_s: float) -> int:
+        return await asyncio.to_thread(self._prune, max_age_s)
+
+    async def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+def open_session_registry(url: str) -> SessionRegistry:
+    # Other backends (Redis, a database service) plug in here behind the same protocol.
+    if url.startswith("sqlite://"):
+        return SqliteSessionRegistry(url.removeprefix("sqlite://"))
+    if "://" not in url:
+        return SqliteSessionRegistry(url)
+    raise ValueError(f"Unsupported session registry: {url}")
@@ -0,0 +1,102 @@
+import asyncio
+import json
+import os
+import re
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+_SESSION_ID = re.compile(r"^[A-Za-z0-9-]{1,64}$")
+
+
+@dataclass
+class SessionSnapshot:
+    session_id: str
+    url: str
+    storage_state: dict[str, Any]
+    frame_mime_type: str | None
+    frame_base64: str | None
+    ui_bytes_saved: int
+    model_bytes_saved: int
+    updated_at_ms: int
+    spilled_at_ms: int
+    frame_seq: int = 1
+    history: list[dict[str, Any]] = field(default_factory=list)
+
+
+class SessionStore:
+    def __init__(self, directory: str) -> None:
+        self.directory = Path(directory)
+
+    def _path(self, session_id: str) -> Path | None:
+        # Session ids come from clients; never let one escape the directory.
+        if not _SESSION_ID.match(session_id):
+            return None
+        return self.directory / f"{session_id}.json"
+
+    def _write(self, snapshot: SessionSnapshot) -> None:
+        path = self._path(snapshot.session_id)
+        if path is None:
+            raise ValueError(f"Invalid session id: {snapshot.session_id}")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Storage state holds cookies; mkstemp creates the file 0600 before anything is
+        # written, and its unique name keeps overlapping spills apart.
+        fd, temp_name = tempfile.mkstemp(dir=self.directory, prefix=f"{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(json.dumps(asdict(snapshot), separators=(",", ":")))
+            os.replace(temp_name, path)
+        except BaseException:
+            try:
+                os.unlink(temp_name)
+            except OSError:
+                pass
+            raise
+
+    def _read(self, session_id: str) -> SessionSnapshot | None:
+        path = self._path(session_id)
+        if path is None:
+            return None
+        try:
+            return SessionSnapshot(**json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def _delete(self, session_id: str) -> None:
+        path = self._path(session_id)
+        if path is None:
+            return
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def _prune(self, max_age_s: float) -> int:
+        cutoff = time.time() - max_age_s
+        removed = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def contains(self, session_id: str) -> bool:
+        path = self._path(session_id)
+        return path is not None and path.exists()
+
+    async def save(self, snapshot: SessionSnapshot) -> None:
+        await asyncio.to_thread(self._write, snapshot)
+
+    async def load(self, session_id: str) -> SessionSnapshot | None:
+        return await asyncio.to_thread(self._read, session_id)
+
+    async def delete(self, session_id: str) -> None:
+        await asyncio.to_thread(self._delete, session_id)
+
+    async def prune(self, max_age_s: float) -> int:
+        return await asyncio.to_thread(self._prune, max_age_s)
@@ -0,0 +1,167 @@
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from playwright.async_api import Page, Request
+
+# Installed on every context so DOM quietness can be read without a round-trip per mutation.
+DOM_MUTATION_SCRIPT = """
+(() => {
+  window.__operatorLastMutation = performance.now();
+  const observe = () => {
+    new MutationObserver(() => {
+      window.__operatorLastMutation = performance.now();
+    }).observe(document, { subtree: true, childList: true, attributes: true, characterData: true });
+  };
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', observe, { once: true });
+  } else {
+    observe();
+  }
+})();
+"""
+
+_DOM_IDLE_EXPRESSION = (
+    "() => window.__operatorLastMutation === undefined"
+    " ? null : performance.now() - window.__operatorLastMutation"
+)
+
+
+@dataclass(frozen=True)
+class SettleStrategy:
+    name: str
+    wait_for_load: bool = False
+    quiet_ms: int = 0
+    max_ms: int = 0
+
+
+@dataclass
+class NetworkTracker:
+    # Requests open longer than this (long-polling, streaming) do not block settling.
+    long_request_ms: int = 2000
+    last_activity: float = field(default_factory=time.monotonic)
+    _in_flight: dict[Request, float] = field(default_factory=dict)
+
+    def attach(self, page: Page) -> None:
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_request_done)
+        page.on("requestfailed", self._on_request_done)
+
+    def _on_request(self, request: Request) -> None:
+        now = time.monotonic()
+        self._in_flight[request] = now
+        self.last_activity = now
+
+    def _on_request_done(self, request: Request) -> None:
+        self._in_flight.pop(request, None)
+        self.last_activity = time.monotonic()
+
+    def busy(self, now: float) -> bool:
+        cutoff = now - self.long_request_ms / 1000.0
+        return any(started_at > cutoff for started_at in self._in_flight.values())
+
+
+class SettleEngine:
+    def __init__(
+        self,
+        *,
+        mode: str,
+        fixed_ms: int,
+        quiet_ms: int,
+        max_ms: int,
+        check_frames: bool,
+        poll_ms: int = 50,
+    ) -> None:
+        self.mode = mode
+        self.fixed_ms = fixed_ms
+        self.check_frames = check_frames
+        self.poll_ms = poll_ms
+
+        none = SettleStrategy("none")
+        interaction = SettleStrategy("interaction", quiet_ms=max(1, quiet_ms // 2), max_ms=max_ms)
+        navigation = SettleStrategy("navigation", wait_for_load=True, quiet_ms=quiet_ms, max_ms=max_ms)
+        self.default_strategy = navigation
+        self.strategies = {strategy.name: strategy for strategy in (none, interaction, navigation)}
+
+    def strategy_for(self, name: str) -> SettleStrategy:
+        return self.strategies.get(name, self.default_strategy)
+
+    @staticmethod
+    async def _dom_idle_ms(page: Page) -> float | None:
+        try:
+            value = await page.evaluate(_DOM_IDLE_EXPRESSION)
+        except Exception:
+            # Mid-navigation the execution context is gone; the page is not settled.
+            return 0.0
+        return float(value) if isinstance(value, (int, float)) else None
+
+    async def _fixed_settle(self, page: Page) -> None:
+        try:
+            await page.wait_for_load_state(timeout=5000)
+        except Exception:
+            pass
+        await asyncio.sleep(self.fixed_ms / 1000.0)
+
+    async def settle(self, page: Page, network: NetworkTracker, strategy_name: str) -> dict[str, Any]:
+        started_at = time.monotonic()
+        strategy = self.strategy_for(strategy_name)
+        if strategy.max_ms <= 0:
+            # No-op actions skip the wait in every mode.
+            return {"settle_strategy": strategy.name, "settle_ms": 0}
+        if self.mode == "fixed":
+            await self._fixed_settle(page)
+            return {
+                "settle_strategy": "fixed",
+                "settle_ms": int((time.monotonic() - started_at) * 1000),
+            }
+
+        deadline = started_at + strategy.max_ms / 1000.0
+        quiet_s = strategy.quiet_ms / 1000.0
+        if strategy.wait_for_load:
+            try:
+                await page.wait_for_load_state(
+                    "domcontentloaded",
+                    timeout=max(1, int((deadline - time.monotonic()) * 1000)),
+                )
+            except Exception:
+                pass
+
+        previous_digest: bytes | None = None
+        timed_out = True
+        while time.monotonic() < deadline:
+            now = time.monotonic()
+            network_quiet = (
+                not network.busy(now)
+                and now - max(network.last_activity, started_at) >= quiet_s
+            )
+            if network_quiet:
+                dom_idle_ms = await self._dom_idle_ms(page)
+                since_start_ms = (time.monotonic() - started_at) * 1000
+                # Pages without the observer (e.g. about:blank) fall back to network quiet.
+                dom_quiet = min(
+                    dom_idle_ms if dom_idle_ms is not None else since_start_ms,
+                    since_start_ms,
+                ) >= strategy.quiet_ms
+                if dom_quiet:
+                    if not self.check_frames:
+                        timed_out = False
+                        break
+                    try:
+                        frame = await page.screenshot(type="jpeg", quality=30)
+                    except Exception:
+                        frame = b""
+                    digest = hashlib.blake2b(frame, digest_size=16).digest()
+                    if digest == previous_digest:
+                        timed_out = False
+                        break
+                    previous_digest = digest
+                    continue
+            await asyncio.sleep(self.poll_ms / 1000.0)
+
+        return {
+            "settle_strategy": strategy.name,
+            "settle_ms": int((time.monotonic() - started_at) * 1000),
+            "settle_timed_out": timed_out,
+        }
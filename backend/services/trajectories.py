@@ -0,0 +1,178 @@
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from google.genai import types
+
+from services.frames import Frame
+
+TRAJECTORY_VERSION = 1
+
+
+def instruction_key(instruction: str) -> str:
+    normalized = " ".join(instruction.split()).lower()
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _compact_content(content: types.Content) -> dict[str, Any]:
+    # Thought text is never needed to replay a turn; signatures are kept so a live
+    # fallback can continue the same conversation.
+    parts = [
+        part
+        for part in content.parts or []
+        if not (getattr(part, "thought", False) and getattr(part, "thought_signature", None) is None)
+    ]
+    return types.Content(role=content.role, parts=parts).model_dump(mode="json", exclude_none=True)
+
+
+@dataclass
+class TrajectoryStep:
+    url: str
+    mime_type: str
+    digest: str
+    perceptual_hash: int | None
+    content: dict[str, Any]
+    results: list[str] = field(default_factory=list)
+
+    @classmethod
+    def observe(cls, *, url: str, frame: Frame, content: types.Content) -> "TrajectoryStep":
+        return cls(
+            url=url,
+            mime_type=frame.mime_type,
+            digest=frame.digest.hex(),
+            perceptual_hash=frame.perceptual_hash,
+            content=_compact_content(content),
+        )
+
+    def mismatch(self, *, url: str, frame: Frame, perceptual_distance: int) -> str | None:
+        if url != self.url:
+            return f"url changed: expected {self.url}, got {url}"
+        if frame.mime_type != self.mime_type:
+            return "frame format changed"
+        if frame.digest.hex() == self.digest:
+            return None
+        if perceptual_distance >= 0 and self.perceptual_hash is not None:
+            observed = frame.perceptual_hash
+            if observed is not None and bin(observed ^ self.perceptual_hash).count("1") <= perceptual_distance:
+                return None
+        return "page content changed"
+
+    def model_content(self) -> types.Content:
+        return types.Content.model_validate(self.content)
+
+
+@dataclass
+class Trajectory:
+    instruction: str
+    model: str
+    steps: list[TrajectoryStep]
+    recorded_at_ms: int = field(default_factory=lambda: int(time.time() * 1000))
+    version: int = TRAJECTORY_VERSION
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, Any]) -> "Trajectory":
+        return cls(
+            instruction=raw["instruction"],
+            model=raw["model"],
+            steps=[TrajectoryStep(**step) for step in raw["steps"]],
+            recorded_at_ms=raw["recorded_at_ms"],
+            version=raw["version"],
+        )
+
+
+class TrajectoryRecorder:
+    def __init__(self, *, instruction: str, model: str) -> None:
+        self.instruction = instruction
+        self.model = model
+        self.steps: list[TrajectoryStep] = []
+        self.live_turns = 0
+
+    def record(
+        self,
+        *,
+        url: str,
+        frame: Frame,
+        content: types.Content,
+        results: list[str],
+        replayed: bool,
+    ) -> None:
+        step = TrajectoryStep.observe(url=url, frame=frame, content=content)
+        step.results = results
+        self.steps.append(step)
+        if not replayed:
+            self.live_turns += 1
+
+    def trajectory(self) -> Trajectory:
+        return Trajectory(instruction=self.instruction, model=self.model, steps=list(self.steps))
+
+
+class TrajectoryReplay:
+    def __init__(self, trajectory: Trajectory, *, perceptual_distance: int) -> None:
+        self.steps = trajectory.steps
+        self.perceptual_distance = perceptual_distance
+        self.position = 0
+        self.active = True
+        self.divergence: str | None = None
+
+    def next_step(self, *, url: str, frame: Frame) -> TrajectoryStep | None:
+        if not self.active:
+            return None
+        if self.position >= len(self.steps):
+            self.active = False
+            self.divergence = "recorded trajectory exhausted"
+            return None
+        step = self.steps[self.position]
+        reason = step.mismatch(url=url, frame=frame, perceptual_distance=self.perceptual_distance)
+        if reason is not None:
+            self.active = False
+            self.divergence = reason
+            return None
+        self.position += 1
+        return step
+
+
+class TrajectoryStore:
+    def __init__(self, directory: str) -> None:
+        self.directory = Path(directory)
+
+    def _path(self, instruction: str) -> Path:
+        return self.directory / f"{instruction_key(instruction)}.json"
+
+    def _read(self, instruction: str) -> Trajectory | None:
+        try:
+            raw = json.loads(self._path(instruction).read_text(encoding="utf-8"))
+            trajectory = Trajectory.from_dict(raw)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if trajectory.version != TRAJECTORY_VERSION:
+            return None
+        return trajectory
+
+    def _write(self, trajectory: Trajectory) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(trajectory.instruction)
+        # Saves overlap on worker threads, so each gets its own temp file. Steps hold
+        # typed text, passwords included; mkstemp creates the file with mode 0600.
+        fd, temp_name = tempfile.mkstemp(dir=self.directory, prefix=f"{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(json.dumps(asdict(trajectory), separators=(",", ":")))
+            os.replace(temp_name, path)
+        except BaseException:
+            try:
+                os.unlink(temp_name)
+            except OSError:
+                pass
+            raise
+
+    async def load(self, instruction: str) -> Trajectory | None:
+        return await asyncio.to_thread(self._read, instruction)
+
+    async def save(self, trajectory: Trajectory) -> None:
+        await asyncio.to_thread(self._write, trajectory)
@@ -0,0 +1,52 @@
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib encoder is the fallback.
+    orjson = None
+
+from services.metrics import OperatorMetrics
+
+T = TypeVar("T")
+
+
+def dumps(data: Any) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(data).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(data, ensure_ascii=True)
+
+
+class WorkerPool:
+    # Base64, hashing, image work and large JSON payloads run here so the event
+    # loop keeps serving other streams and Playwright's protocol traffic.
+    # hashlib and Pillow release the GIL; the rest at least yields between jobs.
+    def __init__(self, max_workers: int) -> None:
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="operator-encode")
+            if max_workers > 0
+            else None
+        )
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._executor is None:
+            return func(*args)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def monitor_loop_lag(metrics: OperatorMetrics, interval_s: float) -> None:
+    # A sleep that wakes late measures how long other callbacks held the loop.
+    while True:
+        expected = time.perf_counter() + interval_s
+        await asyncio.sleep(interval_s)
+        metrics.loop_lag_seconds.observe(max(0.0, time.perf_counter() - expected))
@@ -1,5 +1,5 @@
 import { FormEvent, useEffect, useLayoutEffect, useMemo, useRef, useState } from 'react'
-import { streamComputerUse } from '../lib/computerUseClient'
+import { FrameFields, frameUrl, stopComputerUse, streamComputerUse } from '../lib/computerUseClient'
 import { BrowserActionStatus, BrowserState } from '../types/browser'
 
 type MessageStatus = 'streaming' | 'done' | 'error'
@@ -18,21 +18,42 @@ interface ChatMessage {
   text: string
   status: MessageStatus
   model?: string
+  streamKey?: string
   actions?: AgentAction[]
   error?: string
 }
 
 interface AgentPanelProps {
+  liveView: boolean
   onBrowserStateChange: (update: Partial<BrowserState>) => void
 }
 
-const AgentPanel = ({ onBrowserStateChange }: AgentPanelProps) => {
+// Unchanged frames arrive without image data; keep the image already on screen.
+const frameUpdate = (payload: FrameFields): Partial<BrowserState> => {
+  if (payload.screenshot_url) {
+    return {
+      screenshotBase64: null,
+      screenshotUrl: frameUrl(payload.screenshot_url),
+      screenshotMimeType: payload.screenshot_mime_type ?? null,
+    }
+  }
+  return payload.screenshot_base64
+    ? {
+      screenshotBase64: payload.screenshot_base64,
+      screenshotUrl: null,
+      screenshotMimeType: payload.screenshot_mime_type ?? null,
+    }
+    : {}
+}
+
+const AgentPanel = ({ liveView, onBrowserStateChange }: AgentPanelProps) => {
   const [isListening, setIsListening] = useState(false)
   const [messages, setMessages] = useState<ChatMessage[]>([])
   const [followUp, setFollowUp] = useState('')
   const [isStreaming, setIsStreaming] = useState(false)
   const [panelError, setPanelError] = useState<string | null>(null)
   const [sessionId, setSessionId] = useState<string | null>(null)
+  const [queuePosition, setQueuePosition] = useState<number | null>(null)
   const fileInputRef = useRef<HTMLInputElement>(null)
   const streamAbortRef = useRef<AbortController | null>(null)
   const logRef = useRef<HTMLDivElement>(null)
@@ -40,10 +61,10 @@ const AgentPanel = ({ onBrowserStateChange }: AgentPanelProps) => {
 
   const statusLabel = useMemo(() => {
     if (isStreaming) {
-      return 'Running browser actions'
+      return queuePosition ? `Queued (position ${queuePosition})` : 'Running browser actions'
     }
     return isListening ? 'Listening' : ''
-  }, [isListening, isStreaming])
+  }, [isListening, isStreaming, queuePosition])
 
   useEffect(() => {
     return () => {
@@ -86,6 +107,9 @@ const AgentPanel = ({ onBrowserStateChange }: AgentPanelProps) => {
   }
 
   const onCancel = () => {
+    if (sessionId) {
+      void stopComputerUse(sessionId)
+    }
     streamAbortRef.current?.abort()
     streamAbortRef.current = null
     setIsStreaming(false)
@@ -111,6 +135,7 @@ const AgentPanel = ({ onBrowserStateChange }: AgentPanelProps) => {
     ])
     setFollowUp('')
 
+    setQueuePosition(null)
     setIsStreaming(true)
     onBrowserStateChange({ isBusy: true })
     const controller = new AbortController()
@@ -118,21 +143,33 @@ const AgentPanel = ({ onBrowserStateChange }: AgentPanelProps) => {
 
     try {
       await streamComputerUse(
-        { message: trimmed, session_id: sessionId },
+        // Events skip frames only while the live view is actually delivering them.
+        { message: trimmed, session_id: sessionId, include_screenshots: !liveView },
         {
+          onQueued: (payload) => {
+            setQueuePosition(payload.position)
+          },
           onSession: (payload) => {
+            setQueuePosition(null)
             setSessionId(payload.session_id)
             onBrowserStateChange({
               sessionId: payload.session_id,
               url: payload.url,
-              screenshotBase64: payload.screenshot_base64,
+              ...frameUpdate(payload),
               updatedAtMs: payload.updated_at_ms,
             })
           },
           onAssistant: (payload) => {
+            // Chunks of the same turn and kind are fragments of one streamed part.
+            const streamKey = `${payload.turn}:${payload.thought ? 'thought' : 'text'}`
             updateMessage(assistantId, (message) => ({
               ...message,
-              text: message.text ? `${message.text}\n\n${payload.text}` : payload.text,
+              text: !message.text
+                ? payload.text
+                : message.streamKey === streamKey
+                  ? `${message.text}${payload.text}`
+                  : `${message.text}\n\n${payload.text}`,
+              streamKey,
               status: 'streaming',
             }))
           },
@@ -154,7 +191,7 @@ const AgentPanel = ({ onBrowserStateChange }: AgentPanelProps) => {
             onBrowserStateChange({
               sessionId: payload.session_id,
               url: payload.url,
-              screenshotBase64: payload.screenshot_base64,
+              ...frameUpdate(payload),
               updatedAtMs: payload.updated_at_ms,
               lastAction: payload.action,
               lastActionStatus: payload.status,
@@ -171,7 +208,7 @@ const AgentPanel = ({ onBrowserStateChange }: AgentPanelProps) => {
             onBrowserStateChange({
               sessionId: payload.session_id,
               url: payload.url,
-              screenshotBase64: payload.screenshot_base64,
+              ...frameUpdate(payload),
               updatedAtMs: payload.updated_at_ms,
               isBusy: false,
             })
@@ -180,6 +217,10 @@ const AgentPanel = ({ onBrowserStateChange }: AgentPanelProps) => {
           },
           onError: (payload) => {
             const errorText = payload.error.message || 'Streaming failed.'
+            if (payload.error.type === 'session_evicted' || payload.error.type === 'session_crashed') {
+              // The backend closed this session; the next message starts a fresh one.
+              setSessionId(null)
+            }
             updateMessage(assistantId, (message) => ({
               ...message,
               status: 'error',
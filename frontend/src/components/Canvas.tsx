@@ -1,14 +1,69 @@
+import { useEffect, useRef, useState } from 'react'
+import { LIVE_VIEW_SUPPORTED, liveViewUrl } from '../lib/computerUseClient'
 import { BrowserState } from '../types/browser'
 
 interface CanvasProps {
   browserState: BrowserState
+  onBrowserStateChange: (update: Partial<BrowserState>) => void
 }
 
-const Canvas = ({ browserState }: CanvasProps) => {
-  const hasLiveView = Boolean(browserState.screenshotBase64)
-  const screenshotSrc = hasLiveView
-    ? `data:image/png;base64,${browserState.screenshotBase64}`
-    : null
+const Canvas = ({ browserState, onBrowserStateChange }: CanvasProps) => {
+  const [liveFrameSrc, setLiveFrameSrc] = useState<string | null>(null)
+  const liveRef = useRef(false)
+  const { sessionId } = browserState
+
+  useEffect(() => {
+    if (!sessionId || !LIVE_VIEW_SUPPORTED) {
+      return
+    }
+
+    let currentSrc: string | null = null
+    const socket = new WebSocket(liveViewUrl(sessionId))
+    socket.binaryType = 'blob'
+    socket.onmessage = (event) => {
+      const nextSrc = URL.createObjectURL(event.data as Blob)
+      setLiveFrameSrc(nextSrc)
+      if (currentSrc) {
+        URL.revokeObjectURL(currentSrc)
+      }
+      currentSrc = nextSrc
+      if (!liveRef.current) {
+        liveRef.current = true
+        onBrowserStateChange({ liveView: true })
+      }
+    }
+    // Error closes (4404/4409/4410, proxies without WebSocket upgrades) hand frames back
+    // to the agent events; the last live frame stays up until a newer one arrives there.
+    socket.onclose = () => {
+      liveRef.current = false
+      onBrowserStateChange({ liveView: false })
+    }
+
+    return () => {
+      socket.onclose = null
+      socket.close()
+      if (currentSrc) {
+        URL.revokeObjectURL(currentSrc)
+      }
+      setLiveFrameSrc(null)
+      liveRef.current = false
+      onBrowserStateChange({ liveView: false })
+    }
+  }, [sessionId, onBrowserStateChange])
+
+  const eventFrameSrc = browserState.screenshotUrl
+    ?? (browserState.screenshotBase64
+      ? `data:${browserState.screenshotMimeType ?? 'image/png'};base64,${browserState.screenshotBase64}`
+      : null)
+
+  useEffect(() => {
+    if (!liveRef.current) {
+      setLiveFrameSrc(null)
+    }
+  }, [eventFrameSrc])
+
+  const screenshotSrc = liveFrameSrc ?? eventFrameSrc
+  const hasLiveView = Boolean(screenshotSrc)
 
   const urlLabel = browserState.url
     ? (() => {
@@ -15,10 +15,13 @@ const Layout = () => {
     sessionId: null,
     url: '',
     screenshotBase64: null,
+    screenshotUrl: null,
+    screenshotMimeType: null,
     updatedAtMs: null,
     lastAction: null,
     lastActionStatus: null,
     isBusy: false,
+    liveView: false,
   })
 
   const onBrowserStateChange = useCallback((update: Partial<BrowserState>) => {
@@ -51,7 +54,7 @@ const Layout = () => {
           tabIndex={-1}
           aria-label="Playwright browser viewer"
         >
-          <Canvas browserState={browserState} />
+          <Canvas browserState={browserState} onBrowserStateChange={onBrowserStateChange} />
         </main>
 
         {/* Chat panel */}
@@ -60,7 +63,7 @@ const Layout = () => {
           role="complementary"
           aria-label="AI Assistant Panel"
         >
-          <AgentPanel onBrowserStateChange={onBrowserStateChange} />
+          <AgentPanel liveView={browserState.liveView} onBrowserStateChange={onBrowserStateChange} />
         </aside>
       </div>
     </div>
@@ -2,41 +2,66 @@ export interface ComputerUseRequest {
   message: string
   session_id?: string | null
   max_turns?: number
+  include_screenshots?: boolean
 }
 
-export interface SessionPayload {
+// Omitted screenshot fields mean the frame is identical to the last one sent.
+// Frames arrive either inline as base64 or as a URL to fetch from the frame store.
+export interface FrameFields {
+  screenshot_base64?: string
+  screenshot_id?: number
+  screenshot_url?: string
+  screenshot_mime_type?: string
+  screenshot_unchanged: boolean
+}
+
+export interface SessionPayload extends FrameFields {
   session_id: string
+  recovered: boolean
+  restored: boolean
   url: string
-  screenshot_base64: string
   updated_at_ms: number
 }
 
-export interface ActionPayload {
+export interface ActionPayload extends FrameFields {
   session_id: string
   action: string
   args: Record<string, unknown>
   status: 'ok' | 'error' | 'blocked'
   message: string
+  settle_strategy?: string
+  settle_ms?: number
+  replayed?: boolean
   url: string
-  screenshot_base64: string
   updated_at_ms: number
 }
 
 export interface AssistantPayload {
   session_id: string
   text: string
+  thought: boolean
   turn: number
+  replayed?: boolean
 }
 
-export interface DonePayload {
+export interface DonePayload extends FrameFields {
   session_id: string
   response: string
   model: string
+  replayed_turns?: number
+  stopped?: boolean
+  requests?: Record<string, { blocked: number; cache_hits: number; cache_bytes: number }>
+  ui_bytes_saved: number
+  model_bytes_saved: number
   url: string
-  screenshot_base64: string
   updated_at_ms: number
 }
 
+export interface QueuedPayload {
+  session_id?: string | null
+  position: number
+}
+
 export interface ErrorPayload {
   session_id?: string | null
   error: {
@@ -47,6 +72,7 @@ export interface ErrorPayload {
 }
 
 export interface ComputerUseCallbacks {
+  onQueued?: (payload: QueuedPayload) => void
   onSession?: (payload: SessionPayload) => void
   onAction?: (payload: ActionPayload) => void
   onAssistant?: (payload: AssistantPayload) => void
@@ -59,6 +85,18 @@ const getBaseUrl = () => {
   return typeof envUrl === 'string' && envUrl.trim().length > 0 ? envUrl.trim() : ''
 }
 
+export const frameUrl = (path: string) => `${getBaseUrl().replace(/\/$/, '')}${path}`
+
+// The live view streams frames over a WebSocket; agent events skip them once it is delivering.
+export const LIVE_VIEW_SUPPORTED = typeof WebSocket !== 'undefined'
+
+export const liveViewUrl = (sessionId: string) => {
+  const base = getBaseUrl() || window.location.origin
+  const url = new URL(`${base.replace(/\/$/, '')}/api/gemini/${encodeURIComponent(sessionId)}/live`)
+  url.protocol = url.protocol === 'https:' ? 'wss:' : 'ws:'
+  return url.toString()
+}
+
 const parseSseBlock = (block: string) => {
   const lines = block.split('\n')
   let event = 'message'
@@ -87,6 +125,17 @@ const parseSseBlock = (block: string) => {
   }
 }
 
+// Aborting the stream also stops the run, but proxies may hold the upstream
+// connection open; an explicit stop frees the session right away.
+export const stopComputerUse = async (sessionId: string): Promise<void> => {
+  const baseUrl = getBaseUrl()
+  try {
+    await fetch(`${baseUrl}/api/gemini/${encodeURIComponent(sessionId)}/stop`, { method: 'POST' })
+  } catch {
+    // The run also ends when the aborted stream is noticed server-side.
+  }
+}
+
 export const streamComputerUse = async (
   input: ComputerUseRequest,
   callbacks: ComputerUseCallbacks,
@@ -102,6 +151,7 @@ export const streamComputerUse = async (
       message: input.message,
       session_id: input.session_id ?? null,
       max_turns: input.max_turns,
+      include_screenshots: input.include_screenshots,
     }),
     signal,
   })
@@ -142,7 +192,9 @@ export const streamComputerUse = async (
       const parsed = parseSseBlock(block)
       if (parsed) {
         const { event, data } = parsed
-        if (event === 'session' && data?.session_id) {
+        if (event === 'queued' && typeof data?.position === 'number') {
+          callbacks.onQueued?.(data as QueuedPayload)
+        } else if (event === 'session' && data?.session_id) {
           callbacks.onSession?.(data as SessionPayload)
         } else if (event === 'action' && data?.action) {
           callbacks.onAction?.(data as ActionPayload)
@@ -4,8 +4,12 @@ export interface BrowserState {
   sessionId: string | null
   url: string
   screenshotBase64: string | null
+  screenshotUrl: string | null
+  screenshotMimeType: string | null
   updatedAtMs: number | null
   lastAction: string | null
   lastActionStatus: BrowserActionStatus | null
   isBusy: boolean
+  // True once the live-view socket has delivered a frame and until it closes.
+  liveView: boolean
 }